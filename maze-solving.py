@@ -7,8 +7,10 @@ This application uses Prim's algorithm to create random mazes and compares diffe
 Breadth-First Search Method
 Depth-First Search Method
 Iterative Depth-First Search Method
+Iterative Deepening A* Search Method
 Dijkstra Search Method
 A* Search Method
+Jump Point Search Method
 
 """
 
@@ -21,25 +23,50 @@ __status__ = "Development"
 #                    Configuration Parameters
 # **************************************************************
 PRINT_INFO = False
+# Record the search agents expansions, even when no trace recorder is given
 PRINT_DEBUG = False
+# Maze printing colors, where None uses colors only when the terminal supports them
+PRINT_COLOR = None
 
 # **************************************************************
 #                           Libraries
 # **************************************************************
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from random import randint as rand
 from termcolor import colored
+import argparse
+import contextlib
+import csv
+import hashlib
+import heapq
+import json
 import numpy
+import os
 import queue
+import sys
 import time
+import tracemalloc
+import zlib
 
 
 # **************************************************************
 #                           Maze Class
 # **************************************************************
 class Maze:
-    """Class designed to create a maze using the Randomized Prim's Algorithm.
+    """Class designed to create a randomized maze.
+
+    Mazes are generated raising random aisles over an empty field or, as perfect mazes, using the Randomized Kruskal's
+    Algorithm. The map is stored as a uint8 grid of the hall, wall, start and goal values, and the marked and selected
+    positions are kept in a separate uint8 overlay layer, only allocated when a position is marked or selected. The
+    position values combine both layers as (base value + 4 * overlay value).
     """
 
+    GENERATION_ALGORITHMS = ("aisles", "kruskal")
+
+    # Neighbor directions [dy, dx], in the upper, lower, left and right order
+    DIRECTIONS = ((1, 0), (-1, 0), (0, -1), (0, 1))
+
     HALL_INDEX = 0
     WALL_INDEX = 1
     START_INDEX = 2
@@ -53,7 +80,26 @@ class Maze:
     SELECTED_START_INDEX = 10
     SELECTED_GOAL_INDEX = 11
 
-    def __init__(self, width=5, height=5, complexity=0.75, density=0.75):
+    # Overlay layer values, added to the base values as multiples of 4
+    OVERLAY_NONE = 0
+    OVERLAY_MARKED = 1
+    OVERLAY_SELECTED = 2
+
+    # Printed (text, color, background color) of each position value
+    CELL_STYLES = ((" ", None, None), (" ", "white", "on_white"), ("O", "green", None), ("x", "red", None),
+                   (" ", "red", "on_red"), ("=", None, "on_red"), ("O", None, "on_red"), ("x", None, "on_red"),
+                   (" ", "yellow", "on_yellow"), ("=", None, "on_yellow"), ("O", None, "on_yellow"),
+                   ("x", None, "on_yellow"))
+    # Printed text of each position value, without colors
+    PLAIN_CELLS = " #Ox.=Ox+%Ox"
+    # Color (prefix, text, suffix) strings of each position value, built on the first colored print
+    _color_cells = None
+    # Image RGB color of each position value
+    CELL_COLORS = numpy.array([[255, 255, 255], [40, 40, 40], [0, 160, 0], [220, 0, 0],
+                               [240, 120, 120], [120, 20, 20], [0, 120, 0], [160, 0, 0],
+                               [250, 220, 60], [140, 120, 20], [0, 140, 60], [200, 60, 0]], dtype=numpy.uint8)
+
+    def __init__(self, width=5, height=5, complexity=0.75, density=0.75, seed=None, algorithm="aisles"):
         """Initializes the maze creation class.
 
         Define attributes and generate a randomized maze.
@@ -63,6 +109,9 @@ class Maze:
             height (int, optional): Defines the maze's height. Defaults to 5.
             complexity (float, optional): Defines the maze's complexity. Defaults to 0.75.
             density (float, optional): Defines the maze's density. Defaults to 0.75.
+            seed (int or numpy.random.Generator, optional): The random number generator or its seed. Defaults to None,
+                                                            which creates an unpredictable maze.
+            algorithm (str, optional): The generation algorithm, "aisles" or "kruskal". Defaults to "aisles".
         """
 
         if (width > 5):
@@ -85,63 +134,145 @@ class Maze:
         else:
             self.__density = 0.75
 
+        if (algorithm not in self.GENERATION_ALGORITHMS):
+            raise ValueError("Unknown maze generation algorithm: " + str(algorithm))
+        self.__algorithm = algorithm
+        self.__random = numpy.random.default_rng(seed)
+
         # Generate the maze
         self.generate()
 
     def generate(self):
         """Maze generation method.
+
+        The random values are drawn from the maze random number generator, so mazes created with the same seed are
+        identical.
         """
 
         # Defines an odd shape
         shape = (((self.__height // 2) * 2) + 1, ((self.__width // 2) * 2) + 1)
-
-        # Adjust complexity and density relative to maze size
-        self.__complexity = int(self.__complexity * (5 * (shape[0] + shape[1])))
-        self.__density = int(self.__density * ((shape[0] // 2) * (shape[1] // 2)))
+        self.__neighbor_mask = None
+        self.__junction_graph = None
+        self.__fingerprint = None
+        self.__overlay = None
 
         # Build actual maze
-        self.__map = numpy.zeros(shape, dtype=int)
+        if (self.__algorithm == "kruskal"):
+            self.__map = self.__generate_kruskal(shape)
+        else:
+            self.__map = self.__generate_aisles(shape)
+
+        # Define the starting and goal points among the hall positions
+        halls = numpy.flatnonzero(self.__map == self.HALL_INDEX)
+        start, goal = self.__random.choice(halls, size=2, replace=False).tolist()
+        self.__start_position = list(divmod(start, shape[1]))
+        self.__goal_position = list(divmod(goal, shape[1]))
+        self.__map[self.__start_position[0], self.__start_position[1]] = self.START_INDEX
+        self.__map[self.__goal_position[0], self.__goal_position[1]] = self.GOAL_INDEX
+
+    def __generate_aisles(self, shape):
+        """Builds a maze map raising random walls (aisles) over an empty field.
+
+        Each aisle starts at a random even position and takes up to complexity random steps of two positions, raising
+        the walls along the way, until it gets stuck among other walls. The map is kept in a flat bytearray during the
+        generation and the random values are drawn in blocks.
+
+        Args:
+            shape (tuple): The maze map (height, width) odd shape.
+
+        Returns:
+            numpy.ndarray: The maze uint8 map.
+        """
+        height, width = shape
+
+        # Adjust complexity and density relative to maze size
+        complexity = max(0, int(self.__complexity * (5 * (height + width))))
+        density = max(0, int(self.__density * ((height // 2) * (width // 2))))
 
         # Fill borders
-        self.__map[0, :] = self.__map[-1, :] = 1
-        self.__map[:, 0] = self.__map[:, -1] = 1
+        grid = numpy.zeros(shape, dtype=numpy.uint8)
+        grid[0, :] = grid[-1, :] = 1
+        grid[:, 0] = grid[:, -1] = 1
+        grid = bytearray(grid.tobytes())
 
         # Make aisles
-        for i in range(self.__density):
-            x = rand(0, (shape[1] // 2)) * 2
-            y = rand(0, (shape[0] // 2)) * 2
-            self.__map[y, x] = 1
-            for j in range(self.__complexity):
+        rows = (self.__random.integers(0, (height // 2) + 1, density) * 2).tolist()
+        columns = (self.__random.integers(0, (width // 2) + 1, density) * 2).tolist()
+        draws = []
+        for y, x in zip(rows, columns):
+            index = (y * width) + x
+            grid[index] = 1
+            for j in range(complexity):
                 neighbors = []
                 if (x > 1):
-                    neighbors.append((y, (x - 2)))
-                if (x < (shape[1] - 2)):
-                    neighbors.append((y, (x + 2)))
+                    neighbors.append(index - 2)
+                if (x < (width - 2)):
+                    neighbors.append(index + 2)
                 if (y > 1):
-                    neighbors.append(((y - 2), x))
-                if (y < (shape[0] - 2)):
-                    neighbors.append(((y + 2), x))
-                if (len(neighbors)):
-                    y_, x_ = neighbors[rand(0, (len(neighbors) - 1))]
-                    if (self.__map[y_, x_] == 0):
-                        self.__map[y_, x_] = 1
-                        self.__map[y_ + ((y - y_) // 2), x_ + ((x - x_) // 2)] = 1
-                        x = x_
-                        y = y_
-
-        # Define starting point
-        while True:
-            self.__start_position = [rand(1, shape[0] - 1), rand(1, shape[1] - 1)]
-            if (self.__map[self.__start_position[0], self.__start_position[1]] == 0):
-                self.__map[self.__start_position[0], self.__start_position[1]] = 2
-                break
+                    neighbors.append(index - (2 * width))
+                if (y < (height - 2)):
+                    neighbors.append(index + (2 * width))
+                if (not draws):
+                    draws = self.__random.random(4096).tolist()
+                neighbor = neighbors[int(draws.pop() * len(neighbors))]
+                if (grid[neighbor] == 0):
+                    grid[neighbor] = 1
+                    grid[(index + neighbor) // 2] = 1
+                    index = neighbor
+                    y, x = divmod(index, width)
+                elif (all(grid[n] for n in neighbors)):
+                    # The aisle is stuck, the remaining steps would not change the map
+                    break
+
+        return numpy.frombuffer(grid, dtype=numpy.uint8).reshape(shape).copy()
+
+    def __generate_kruskal(self, shape):
+        """Builds a perfect maze map using the Randomized Kruskal's Algorithm.
+
+        The maze cells are the odd positions of the map. The walls between neighbor cells are shuffled and each wall is
+        removed if the cells it divides are not connected yet, which is tracked using a union-find structure. The
+        complexity and density parameters are not used.
 
-        # Define goal point
-        while True:
-            self.__goal_position = [rand(1, shape[0] - 1), rand(1, shape[1] - 1)]
-            if (self.__map[self.__goal_position[0], self.__goal_position[1]] == 0):
-                self.__map[self.__goal_position[0], self.__goal_position[1]] = 3
-                break
+        Args:
+            shape (tuple): The maze map (height, width) odd shape.
+
+        Returns:
+            numpy.ndarray: The maze uint8 map.
+        """
+        rows, columns = (shape[0] // 2), (shape[1] // 2)
+        grid = numpy.ones(shape, dtype=numpy.uint8)
+        grid[1::2, 1::2] = self.HALL_INDEX
+
+        # List the walls as pairs of neighbor cell indexes and shuffle them
+        cells = numpy.arange(rows * columns).reshape(rows, columns)
+        edges = numpy.concatenate((numpy.stack((cells[:, :-1].ravel(), cells[:, 1:].ravel()), axis=1),
+                                   numpy.stack((cells[:-1, :].ravel(), cells[1:, :].ravel()), axis=1)))
+        edges = edges[self.__random.permutation(len(edges))]
+
+        # Select the walls that join two different sets of cells
+        parent = list(range(rows * columns))
+        selected = bytearray(len(edges))
+        remaining = (rows * columns) - 1
+        for i, (a, b) in enumerate(edges.tolist()):
+            while (parent[a] != a):
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while (parent[b] != b):
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if (a != b):
+                parent[a] = b
+                selected[i] = 1
+                remaining -= 1
+                if (remaining == 0):
+                    break
+
+        # Remove the selected walls, placed between the two cells positions
+        edges = edges[numpy.frombuffer(selected, dtype=bool)]
+        a_y, a_x = numpy.divmod(edges[:, 0], columns)
+        b_y, b_x = numpy.divmod(edges[:, 1], columns)
+        grid[(a_y + b_y + 1), (a_x + b_x + 1)] = self.HALL_INDEX
+        return grid
 
     def get_start_position(self):
         """Returns the defined start position coordinates [y, x].
@@ -159,6 +290,109 @@ class Maze:
         """
         return [self.__goal_position[0], self.__goal_position[1]]
 
+    def get_shape(self):
+        """Returns the maze map shape (height, width).
+
+        Returns:
+            tuple: Returns a tuple containing the (height, width) map dimensions.
+        """
+        return self.__map.shape
+
+    def to_bytes(self):
+        """Returns the maze as a compact byte buffer.
+
+        The buffer holds a header with the (height, width, start y, start x, goal y, goal x) uint32 values, followed by
+        the walls bit-packed in row-major order. Marked and selected positions are stored as their base values.
+
+        Returns:
+            bytes: The maze byte buffer.
+        """
+        header = numpy.array([self.__map.shape[0], self.__map.shape[1], self.__start_position[0],
+                              self.__start_position[1], self.__goal_position[0], self.__goal_position[1]],
+                             dtype=numpy.uint32)
+        walls = self.get_walls()
+        return header.tobytes() + numpy.packbits(walls).tobytes()
+
+    def get_fingerprint(self):
+        """Returns the maze fingerprint, a hash of the maze walls, start and goal positions.
+
+        The fingerprint is computed once and kept until the maze walls change. Marked and selected positions don't
+        change it.
+
+        Returns:
+            str: The fingerprint hexadecimal digest.
+        """
+        if (self.__fingerprint == None):
+            self.__fingerprint = hashlib.blake2b(self.to_bytes(), digest_size=16).hexdigest()
+        return self.__fingerprint
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Creates a maze from a byte buffer created by the to_bytes method.
+
+        Args:
+            data (bytes or numpy.ndarray): The maze byte buffer, or a uint8 array holding it, such as a memmap slice.
+
+        Returns:
+            Maze: The maze object.
+        """
+        height, width, start_y, start_x, goal_y, goal_x = numpy.frombuffer(data, dtype=numpy.uint32, count=6).tolist()
+        walls = numpy.unpackbits(numpy.frombuffer(data, dtype=numpy.uint8, offset=24), count=(height * width))
+        return cls.from_walls(walls.reshape(height, width), [start_y, start_x], [goal_y, goal_x])
+
+    def save(self, path):
+        """Writes the maze to a container file holding only this maze.
+
+        Args:
+            path (str): The container file path.
+        """
+        with MazeWriter(path) as writer:
+            writer.write(self)
+
+    @classmethod
+    def load(cls, path, index=0):
+        """Reads a maze from a container file, mapping the file instead of reading it fully.
+
+        Args:
+            path (str): The container file path.
+            index (int, optional): The maze index in the container. Defaults to 0.
+
+        Returns:
+            Maze: The maze object.
+        """
+        return MazeReader(path)[index]
+
+    @classmethod
+    def from_walls(cls, walls, start_position, goal_position):
+        """Creates a maze from a walls map, without generating it.
+
+        Args:
+            walls (numpy.ndarray): The maze walls map, where non-zero values are walls. Its border must be made of
+                                   walls.
+            start_position (list): The start position coordinates [y, x].
+            goal_position (list): The goal position coordinates [y, x].
+
+        Returns:
+            Maze: The maze object.
+        """
+        maze = cls.__new__(cls)
+        maze.__height, maze.__width = numpy.shape(walls)
+        maze.__complexity = 0
+        maze.__density = 0
+        maze.__algorithm = None
+        maze.__random = numpy.random.default_rng()
+        # The wall value is 1 and the hall value is 0
+        maze.__map = (numpy.asarray(walls) != 0).astype(numpy.uint8)
+        maze.__neighbor_mask = None
+        maze.__junction_graph = None
+        maze.__fingerprint = None
+        maze.__overlay = None
+        maze.__start_position = [int(start_position[0]), int(start_position[1])]
+        maze.__goal_position = [int(goal_position[0]), int(goal_position[1])]
+        maze.__map[maze.__start_position[0], maze.__start_position[1]] = cls.START_INDEX
+        maze.__map[maze.__goal_position[0], maze.__goal_position[1]] = cls.GOAL_INDEX
+        return maze
+
     # Return value of specified position
     def get_position_value(self, y, x):
         """Returns the selected position value.
@@ -170,7 +404,117 @@ class Maze:
         Returns:
             int: The selected position value.
         """
-        return self.__map[y, x]
+        if (self.__overlay is None):
+            return self.__map.item(y, x)
+        return self.__map.item(y, x) + (4 * self.__overlay.item(y, x))
+
+    def get_neighbor_mask(self):
+        """Returns the neighbor index of every maze position.
+
+        The index is built once and kept until the maze walls change. Each position (y * width + x) holds one byte,
+        where the bit d is set if the neighbor in the DIRECTIONS[d] direction is not a wall and the bit (d + 4) is set
+        if that neighbor is inside the map.
+
+        Returns:
+            bytes: The neighbor index, indexed by (y * width + x).
+        """
+        if (self.__neighbor_mask == None):
+            height, width = self.__map.shape
+            halls = numpy.logical_not(self.get_walls())
+            mask = numpy.zeros((height, width), dtype=numpy.uint8)
+            for direction, (dy, dx) in enumerate(self.DIRECTIONS):
+                # Slices of the positions that have a neighbor in this direction, and of those neighbors
+                rows = (slice(max(0, -dy), (height - max(0, dy))), slice(max(0, dy), (height - max(0, -dy))))
+                columns = (slice(max(0, -dx), (width - max(0, dx))), slice(max(0, dx), (width - max(0, -dx))))
+                mask[rows[0], columns[0]] |= numpy.uint8(1 << (direction + 4))
+                mask[rows[0], columns[0]] |= (halls[rows[1], columns[1]].astype(numpy.uint8) << direction)
+            self.__neighbor_mask = mask.tobytes()
+        return self.__neighbor_mask
+
+    def get_walls(self):
+        """Returns the maze walls map.
+
+        Returns:
+            numpy.ndarray: The boolean map, where True values are walls (marked, selected or not).
+        """
+        return (self.__map == self.WALL_INDEX)
+
+    def fill_dead_ends(self):
+        """Creates a working copy of the maze, where the dead-end branches are filled with walls.
+
+        The positions with a single open neighbor, except the start and goal positions, are dead ends and can't be
+        part of a path between them. The open neighbor counts are computed with numpy from the neighbor index, and the
+        dead ends are peeled from a queue, updating the counts of their neighbors, until no dead end is left.
+
+        Returns:
+            tuple: The (maze, removed) values, where maze is the filled maze copy and removed is the number of filled
+                   positions.
+        """
+        height, width = self.__map.shape
+        neighbor_mask = self.get_neighbor_mask()
+        offsets = [((dy * width) + dx) for dy, dx in self.DIRECTIONS]
+        walls = self.get_walls().reshape(-1)
+
+        # Count the open neighbors of every position and protect the start and goal positions
+        mask = numpy.frombuffer(neighbor_mask, dtype=numpy.uint8)
+        degree = numpy.unpackbits((mask & 15)[:, None], axis=1).sum(axis=1)
+        candidates = numpy.logical_and(numpy.logical_not(walls), (degree <= 1))
+        protected = [((position[0] * width) + position[1])
+                     for position in (self.__start_position, self.__goal_position)]
+        candidates[protected] = False
+        degree = degree.tolist()
+        filled = bytearray(walls.astype(numpy.uint8).tobytes())
+        for index in protected:
+            degree[index] = height * width
+
+        # Peel the dead ends until no dead end is left
+        removed = 0
+        dead_ends = deque(numpy.flatnonzero(candidates).tolist())
+        while (dead_ends):
+            index = dead_ends.popleft()
+            filled[index] = 1
+            removed += 1
+            for direction, offset in enumerate(offsets):
+                neighbor = index + offset
+                if ((neighbor_mask[index] & (1 << direction)) and (filled[neighbor] == 0)):
+                    degree[neighbor] -= 1
+                    if (degree[neighbor] == 1):
+                        dead_ends.append(neighbor)
+
+        walls = numpy.frombuffer(filled, dtype=numpy.uint8).reshape(height, width)
+        return Maze.from_walls(walls, self.__start_position, self.__goal_position), removed
+
+    def get_junction_graph(self):
+        """Returns the maze junction graph, where the corridors are contracted into weighted edges.
+
+        The graph is built once and kept until the maze walls change.
+
+        Returns:
+            JunctionGraph: The maze junction graph.
+        """
+        if (self.__junction_graph == None):
+            self.__junction_graph = JunctionGraph(self)
+        return self.__junction_graph
+
+    def get_map(self):
+        """Returns a copy of the maze map, combining the base values with the overlay layer.
+
+        Returns:
+            numpy.ndarray: The maze uint8 map values.
+        """
+        if (self.__overlay is None):
+            return self.__map.copy()
+        return self.__map + (self.__overlay << 2)
+
+    def get_overlay(self):
+        """Returns the overlay layer, allocating it if the maze has no marked or selected positions yet.
+
+        Returns:
+            numpy.ndarray: The uint8 overlay layer, holding the OVERLAY_* values.
+        """
+        if (self.__overlay is None):
+            self.__overlay = numpy.zeros(self.__map.shape, dtype=numpy.uint8)
+        return self.__overlay
 
     def get_neighbors(self, coordinates=[], y=None, x=None):
         """Return the selected coordinate neighbors.
@@ -209,48 +553,131 @@ class Maze:
         Returns:
             list: The neighbor value's list.
         """
-        return [self.__map[y + 1, x], self.__map[y - 1, x], self.__map[y, x - 1], self.__map[y, x + 1]]
+        return [self.get_position_value(y + 1, x), self.get_position_value(y - 1, x),
+                self.get_position_value(y, x - 1), self.get_position_value(y, x + 1)]
 
     def print_map_list(self):
+        values = self.get_map()
         print("[")
-        for row in range(len(self.__map)):
-          text = "\t[" + str(self.__map[row, 0]) + ","
-          for column in range(1, len(self.__map[0])):
-              text += (" " + str(self.__map[row, column]) + ",")
+        for row in range(len(values)):
+          text = "\t[" + str(values[row, 0]) + ","
+          for column in range(1, len(values[0])):
+              text += (" " + str(values[row, column]) + ",")
           print(text + "],")
         print("]")
 
-    def print_map(self):
+    def print_map(self, color=None, file=None):
         """Prints the maze on screen.
+
+        The map values are converted by lookup tables built once for all mazes. Without colors, the whole map is
+        converted with numpy. With colors, each run of equal positions in a row is printed with a single pair of
+        escape sequences. The map is written in a single block.
+
+        Args:
+            color (bool, optional): Print using terminal colors. Defaults to None, which uses PRINT_COLOR and, if it is
+                                    also None, prints colors only when the terminal supports them.
+            file (file, optional): The output text file. Defaults to the standard output.
         """
-        for y in range((self.__height // 2) * 2 + 1):
-            str = " "
-            for x in range((self.__width // 2) * 2 + 1):
-                if (self.__map[y, x] == self.HALL_INDEX):
-                    str = str + " "
-                elif (self.__map[y, x] == self.WALL_INDEX):
-                    str = str + colored(' ', 'white', 'on_white')
-                elif (self.__map[y, x] == self.START_INDEX):
-                    str = str + colored('O', 'green')
-                elif (self.__map[y, x] == self.GOAL_INDEX):
-                    str = str + colored('x', 'red')
-                elif (self.__map[y, x] == self.MARKED_HALL_INDEX):
-                    str = str + colored(' ', 'red', 'on_red')
-                elif (self.__map[y, x] == self.MARKED_WALL_INDEX):
-                    str = str + colored('=', None, 'on_red')
-                elif (self.__map[y, x] == self.MARKED_START_INDEX):
-                    str = str + colored('O', None, 'on_red')
-                elif (self.__map[y, x] == self.MARKED_GOAL_INDEX):
-                    str = str + colored('x', None, 'on_red')
-                elif (self.__map[y, x] == self.SELECTED_HALL_INDEX):
-                    str = str + colored(' ', 'yellow', 'on_yellow')
-                elif (self.__map[y, x] == self.SELECTED_WALL_INDEX):
-                    str = str + colored('=', None, 'on_yellow')
-                elif (self.__map[y, x] == self.SELECTED_START_INDEX):
-                    str = str + colored('O', None, 'on_yellow')
-                elif (self.__map[y, x] == self.SELECTED_GOAL_INDEX):
-                    str = str + colored('x', None, 'on_yellow')
-            print(str)
+        if (color == None):
+            color = PRINT_COLOR
+        if (color == None):
+            color = (colored("x", "red") != "x")
+        if (file == None):
+            file = sys.stdout
+        values = self.get_map()
+        height, width = values.shape
+
+        if (color == False):
+            # Convert the map through the plain text table, adding the left margin and the line breaks
+            text = numpy.full((height, width + 2), b" ", dtype="S1")
+            text[:, 1:-1] = numpy.frombuffer(self.PLAIN_CELLS.encode(), dtype="S1")[values]
+            text[:, -1] = b"\n"
+            file.write(text.tobytes().decode())
+        else:
+            if (Maze._color_cells == None):
+                Maze._color_cells = []
+                for text, text_color, background in self.CELL_STYLES:
+                    prefix, suffix = "", ""
+                    if ((text_color != None) or (background != None)):
+                        prefix, suffix = colored("\0", text_color, background, force_color=True).split("\0")
+                    Maze._color_cells.append((prefix, text, suffix))
+
+            # Print each run of equal positions with a single pair of escape sequences
+            lines = []
+            for row in values:
+                starts = numpy.flatnonzero(row[1:] != row[:-1]) + 1
+                line = [" "]
+                for start, end in zip(([0] + starts.tolist()), (starts.tolist() + [width])):
+                    prefix, text, suffix = Maze._color_cells[row[start]]
+                    line.append(prefix + (text * (end - start)) + suffix)
+                lines.append("".join(line))
+            file.write("\n".join(lines) + "\n")
+        file.flush()
+
+    def save_image(self, path, scale=1, downsample=1, block_rows=256):
+        """Writes the maze map, with its marked and selected positions, to a PNG or PPM image file.
+
+        The map is converted in blocks of rows, each block mapped to RGB colors through the CELL_COLORS palette with
+        numpy and written before the next block is converted, so the image is never fully built in memory. PNG images
+        are compressed with a streaming zlib encoder and PPM images are written as raw binary (P6) rows.
+
+        Args:
+            path (str): The image file path, ending with ".png" or ".ppm".
+            scale (int, optional): The image pixels per map position side. Defaults to 1.
+            downsample (int, optional): The map positions per image pixel side, for previews of large mazes. Each
+                                        pixel shows the highest position value of its block, so the paths, start
+                                        and goal positions stay visible. Defaults to 1.
+            block_rows (int, optional): The number of map rows converted at once. Defaults to 256.
+        """
+        if ((scale < 1) or (downsample < 1)):
+            raise ValueError("The image scale and downsample factors must be at least 1")
+        image_format = path.lower().rsplit(".", 1)[-1]
+        if (image_format not in ("png", "ppm")):
+            raise ValueError("Unknown image format: " + str(path))
+        height, width = self.__map.shape
+        image_height = -(-height // downsample) * scale
+        image_width = -(-width // downsample) * scale
+        block_rows = max(1, block_rows // downsample) * downsample
+
+        with open(path, "wb") as file:
+            if (image_format == "png"):
+                def write_chunk(chunk_type, data):
+                    file.write(numpy.array([len(data)], dtype=">u4").tobytes() + chunk_type + data +
+                               numpy.array([zlib.crc32(chunk_type + data)], dtype=">u4").tobytes())
+                file.write(b"\x89PNG\r\n\x1a\n")
+                # Header with the image size, 8 bits per channel, RGB color type and default methods
+                write_chunk(b"IHDR", numpy.array([image_width, image_height], dtype=">u4").tobytes() +
+                            bytes([8, 2, 0, 0, 0]))
+                encoder = zlib.compressobj()
+            else:
+                file.write(("P6\n" + str(image_width) + " " + str(image_height) + "\n255\n").encode())
+
+            for start in range(0, height, block_rows):
+                # Convert the block of rows, reducing each downsampled block to its highest value
+                values = self.__map[start:(start + block_rows)]
+                if (self.__overlay is not None):
+                    values = values + (self.__overlay[start:(start + block_rows)] << 2)
+                if (downsample > 1):
+                    rows, columns = -(-values.shape[0] // downsample), -(-width // downsample)
+                    padded = numpy.zeros(((rows * downsample), (columns * downsample)), dtype=numpy.uint8)
+                    padded[:values.shape[0], :width] = values
+                    values = padded.reshape(rows, downsample, columns, downsample).max(axis=(1, 3))
+                pixels = self.CELL_COLORS[values]
+                if (scale > 1):
+                    pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+
+                # Write the block of rows
+                if (image_format == "png"):
+                    # Each PNG row starts with its filter type, where 0 means no filter
+                    rows = numpy.zeros((pixels.shape[0], (1 + (3 * image_width))), dtype=numpy.uint8)
+                    rows[:, 1:] = pixels.reshape(pixels.shape[0], -1)
+                    write_chunk(b"IDAT", encoder.compress(rows.tobytes()))
+                else:
+                    file.write(pixels.tobytes())
+
+            if (image_format == "png"):
+                write_chunk(b"IDAT", encoder.flush())
+                write_chunk(b"IEND", b"")
 
     def mark_position(self, y, x):
         """Mark the input position in the map.
@@ -259,22 +686,7 @@ class Maze:
             y (int): The marked position y coordinate.
             x (int): The marked position x coordinate.
         """
-        if (self.__map[y, x] == self.SELECTED_HALL_INDEX):
-            self.__map[y, x] = self.MARKED_HALL_INDEX
-        elif (self.__map[y, x] == self.SELECTED_WALL_INDEX):
-            self.__map[y, x] = self.MARKED_WALL_INDEX
-        elif (self.__map[y, x] == self.SELECTED_START_INDEX):
-            self.__map[y, x] = self.MARKED_START_INDEX
-        elif (self.__map[y, x] == self.SELECTED_GOAL_INDEX):
-            self.__map[y, x] = self.MARKED_GOAL_INDEX
-        elif (self.__map[y, x] == self.HALL_INDEX):
-            self.__map[y, x] = self.MARKED_HALL_INDEX
-        elif (self.__map[y, x] == self.WALL_INDEX):
-            self.__map[y, x] = self.MARKED_WALL_INDEX
-        elif (self.__map[y, x] == self.START_INDEX):
-            self.__map[y, x] = self.MARKED_START_INDEX
-        elif (self.__map[y, x] == self.GOAL_INDEX):
-            self.__map[y, x] = self.MARKED_GOAL_INDEX
+        self.get_overlay()[y, x] = self.OVERLAY_MARKED
 
     def select_position(self, y, x):
         """Select the input position in the map.
@@ -283,60 +695,562 @@ class Maze:
             y (int): The selected position y coordinate.
             x (int): The selected position x coordinate.
         """
-        if (self.__map[y, x] == self.MARKED_HALL_INDEX):
-            self.__map[y, x] = self.SELECTED_HALL_INDEX
-        elif (self.__map[y, x] == self.MARKED_WALL_INDEX):
-            self.__map[y, x] = self.SELECTED_WALL_INDEX
-        elif (self.__map[y, x] == self.MARKED_START_INDEX):
-            self.__map[y, x] = self.SELECTED_START_INDEX
-        elif (self.__map[y, x] == self.MARKED_GOAL_INDEX):
-            self.__map[y, x] = self.SELECTED_GOAL_INDEX
-        elif (self.__map[y, x] == self.HALL_INDEX):
-            self.__map[y, x] = self.SELECTED_HALL_INDEX
-        elif (self.__map[y, x] == self.WALL_INDEX):
-            self.__map[y, x] = self.SELECTED_WALL_INDEX
-        elif (self.__map[y, x] == self.START_INDEX):
-            self.__map[y, x] = self.SELECTED_START_INDEX
-        elif (self.__map[y, x] == self.GOAL_INDEX):
-            self.__map[y, x] = self.SELECTED_GOAL_INDEX
+        self.get_overlay()[y, x] = self.OVERLAY_SELECTED
+
+    def mark_positions(self, coordinates=[]):
+        """Mark the input positions in the map, with a single scatter over the overlay layer.
+
+        Args:
+            coordinates (list or numpy.ndarray): The positions coordinates [y, x].
+        """
+        coordinates = numpy.asarray(coordinates, dtype=numpy.intp).reshape(-1, 2)
+        self.get_overlay()[coordinates[:, 0], coordinates[:, 1]] = self.OVERLAY_MARKED
+
+    def select_positions(self, coordinates=[]):
+        """Select the input positions in the map, with a single scatter over the overlay layer.
+
+        Args:
+            coordinates (list or numpy.ndarray): The positions coordinates [y, x].
+        """
+        coordinates = numpy.asarray(coordinates, dtype=numpy.intp).reshape(-1, 2)
+        self.get_overlay()[coordinates[:, 0], coordinates[:, 1]] = self.OVERLAY_SELECTED
 
     def set_path(self, coordinates=[]):
-        """Mark the input coordinates in the map.
+        """Mark the input coordinates in the map, keeping the selected positions.
 
         Args:
             coordinates (list): The movement coordinates [x, y].
         """
-        for y, x in coordinates:
-            if (self.__map[y, x] == self.HALL_INDEX):
-                self.__map[y, x] = self.MARKED_HALL_INDEX
-            if (self.__map[y, x] == self.WALL_INDEX):
-                self.__map[y, x] = self.MARKED_WALL_INDEX
-            if (self.__map[y, x] == self.START_INDEX):
-                self.__map[y, x] = self.MARKED_START_INDEX
-            elif (self.__map[y, x] == self.GOAL_INDEX):
-                self.__map[y, x] = self.MARKED_GOAL_INDEX
+        coordinates = numpy.asarray(coordinates, dtype=numpy.intp).reshape(-1, 2)
+        overlay = self.get_overlay()
+        rows, columns = coordinates[:, 0], coordinates[:, 1]
+        overlay[rows, columns] = numpy.maximum(overlay[rows, columns], self.OVERLAY_MARKED)
 
     def clear_path(self):
         """Clears any movement values within the maze.
+
+        The overlay layer is released, so clearing takes the same time for any maze size and the next mark allocates
+        a new zeroed layer.
         """
-        for y in range(((self.__height // 2) * 2) + 1):
-            for x in range(((self.__width // 2) * 2) + 1):
-                if (self.__map[y, x] == self.SELECTED_HALL_INDEX):
-                    self.__map[y, x] = self.HALL_INDEX
-                elif (self.__map[y, x] == self.SELECTED_WALL_INDEX):
-                    self.__map[y, x] = self.WALL_INDEX
-                elif (self.__map[y, x] == self.SELECTED_START_INDEX):
-                    self.__map[y, x] = self.START_INDEX
-                elif (self.__map[y, x] == self.SELECTED_GOAL_INDEX):
-                    self.__map[y, x] = self.GOAL_INDEX
-                elif (self.__map[y, x] == self.MARKED_HALL_INDEX):
-                    self.__map[y, x] = self.HALL_INDEX
-                elif (self.__map[y, x] == self.MARKED_WALL_INDEX):
-                    self.__map[y, x] = self.WALL_INDEX
-                elif (self.__map[y, x] == self.MARKED_START_INDEX):
-                    self.__map[y, x] = self.START_INDEX
-                elif (self.__map[y, x] == self.MARKED_GOAL_INDEX):
-                    self.__map[y, x] = self.GOAL_INDEX
+        self.__overlay = None
+
+
+class JunctionGraph:
+    """Maze junction graph.
+
+    This class contracts the maze corridors into a weighted graph. The graph nodes are the hall positions that are not
+    in the middle of a corridor (junctions and dead ends) plus the start and goal positions, and each edge is a corridor
+    between two nodes, weighted by its number of movements. Nodes are identified by their position index
+    (y * width + x).
+    """
+
+    def __init__(self, maze):
+        """Builds the junction graph of the input maze.
+
+        Args:
+            maze (Maze): The maze to be contracted.
+        """
+        height, width = maze.get_shape()
+        neighbor_mask = maze.get_neighbor_mask()
+        offsets = [((dy * width) + dx) for dy, dx in maze.DIRECTIONS]
+        self._width = width
+
+        # Count the open neighbors of every hall position
+        mask = numpy.frombuffer(neighbor_mask, dtype=numpy.uint8)
+        degree = numpy.unpackbits((mask & 15)[:, None], axis=1).sum(axis=1)
+        nodes = numpy.logical_and(numpy.logical_not(maze.get_walls().reshape(-1)), (degree != 2))
+        for position in (maze.get_start_position(), maze.get_goal_position()):
+            nodes[(position[0] * width) + position[1]] = True
+        self._nodes = numpy.flatnonzero(nodes).tolist()
+        is_node = nodes.tolist()
+
+        # Walk along the corridors leaving each node until another node is reached
+        self._edges = {node: [] for node in self._nodes}
+        for node in self._nodes:
+            for direction in range(len(offsets)):
+                if (not (neighbor_mask[node] & (1 << direction))):
+                    continue
+                previous = node
+                current = node + offsets[direction]
+                corridor = []
+                while (not is_node[current]):
+                    corridor.append(current)
+                    following = [(current + offset) for d, offset in enumerate(offsets)
+                                 if ((neighbor_mask[current] & (1 << d)) and ((current + offset) != previous))]
+                    previous, current = current, following[0]
+                # Store each corridor once for each direction, discarding loops back to the same node
+                if (node < current):
+                    corridor = tuple(corridor)
+                    self._edges[node].append((current, (len(corridor) + 1), corridor))
+                    self._edges[current].append((node, (len(corridor) + 1), corridor[::-1]))
+
+    def get_nodes(self):
+        """Returns the graph nodes.
+
+        Returns:
+            list: The node position indexes.
+        """
+        return self._nodes
+
+    def get_edges(self, node):
+        """Returns the edges leaving the input node.
+
+        Args:
+            node (int): The node position index.
+
+        Returns:
+            list: The (neighbor node, weight, corridor) edges, where the corridor holds the position indexes between
+                  the two nodes.
+        """
+        return self._edges[node]
+
+    def get_edge_count(self):
+        """Returns the number of graph edges.
+
+        Returns:
+            int: The number of edges.
+        """
+        return sum(len(edges) for edges in self._edges.values()) // 2
+
+    def expand_path(self, steps):
+        """Expands a graph path back into the maze positions path.
+
+        Args:
+            steps (list): The path (node, corridor) steps, where each corridor leads from the previous node to the
+                          step node. The first step corridor is empty.
+
+        Returns:
+            list: The path coordinates [y, x], in the format used by Maze.set_path.
+        """
+        path = []
+        for node, corridor in steps:
+            for index in corridor:
+                path.append(list(divmod(index, self._width)))
+            path.append(list(divmod(node, self._width)))
+        return path
+
+
+# **************************************************************
+#                      Maze Storage Classes
+# **************************************************************
+class MazeWriter:
+    """Maze container file writer.
+
+    The container file starts with a 24 bytes header holding the b"MAZE" magic value, the uint32 format version, the
+    uint64 number of mazes and the uint64 index offset. The mazes follow the header as to_bytes records, written one at
+    a time, and the file ends with the index, holding the uint64 offset of each record. The header is completed when
+    the writer is closed.
+    """
+
+    MAGIC = b"MAZE"
+    VERSION = 1
+    HEADER_SIZE = 24
+
+    def __init__(self, path):
+        """Creates the container file.
+
+        Args:
+            path (str): The container file path.
+        """
+        self._file = open(path, "wb")
+        self._file.write(bytes(self.HEADER_SIZE))
+        self._offsets = []
+
+    def __enter__(self):
+        """Returns the writer for a with statement.
+
+        Returns:
+            MazeWriter: The writer object.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the writer at the end of a with statement.
+        """
+        self.close()
+
+    def write(self, maze):
+        """Appends a maze to the container file.
+
+        Args:
+            maze (Maze): The maze to be written.
+
+        Returns:
+            int: The maze index in the container.
+        """
+        self._offsets.append(self._file.tell())
+        self._file.write(maze.to_bytes())
+        return len(self._offsets) - 1
+
+    def close(self):
+        """Writes the index and the header, and closes the container file.
+        """
+        if (self._file.closed):
+            return
+        index_offset = self._file.tell()
+        self._file.write(numpy.array(self._offsets, dtype=numpy.uint64).tobytes())
+        self._file.seek(0)
+        self._file.write(self.MAGIC + numpy.array([self.VERSION], dtype=numpy.uint32).tobytes() +
+                         numpy.array([len(self._offsets), index_offset], dtype=numpy.uint64).tobytes())
+        self._file.close()
+
+
+class MazeReader:
+    """Maze container file reader.
+
+    The container file is mapped with numpy.memmap, so opening it doesn't read the mazes and each maze is only read
+    when it is accessed. See MazeWriter for the file format.
+    """
+
+    def __init__(self, path):
+        """Opens the container file.
+
+        Args:
+            path (str): The container file path.
+        """
+        self._data = numpy.memmap(path, dtype=numpy.uint8, mode="r")
+        header = self._data[:MazeWriter.HEADER_SIZE]
+        if ((len(header) < MazeWriter.HEADER_SIZE) or (header[:4].tobytes() != MazeWriter.MAGIC)):
+            raise ValueError("Not a maze container file: " + str(path))
+        version = int(header[4:8].view(numpy.uint32)[0])
+        if (version != MazeWriter.VERSION):
+            raise ValueError("Unsupported maze container version: " + str(version))
+        count, index_offset = header[8:24].view(numpy.uint64).tolist()
+        self._offsets = self._data[index_offset:(index_offset + (8 * count))].view(numpy.uint64)
+        self._end = index_offset
+
+    def __len__(self):
+        """Returns the number of mazes in the container.
+
+        Returns:
+            int: The number of mazes.
+        """
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        """Reads a maze from the container.
+
+        Args:
+            index (int): The maze index in the container.
+
+        Returns:
+            Maze: The maze object.
+        """
+        if (index < 0):
+            index += len(self._offsets)
+        if ((index < 0) or (index >= len(self._offsets))):
+            raise IndexError("Maze index out of range: " + str(index))
+        start = int(self._offsets[index])
+        end = int(self._offsets[index + 1]) if ((index + 1) < len(self._offsets)) else self._end
+        return Maze.from_bytes(self._data[start:end])
+
+    def __iter__(self):
+        """Iterates over the container mazes, reading one maze at a time.
+
+        Returns:
+            iterator: The mazes iterator, in the container order.
+        """
+        for index in range(len(self._offsets)):
+            yield self[index]
+
+
+def save_mazes(path, mazes):
+    """Writes a sequence of mazes to a container file, one maze at a time.
+
+    Args:
+        path (str): The container file path.
+        mazes (iterable): The Maze objects.
+
+    Returns:
+        int: The number of mazes written.
+    """
+    count = 0
+    with MazeWriter(path) as writer:
+        for maze in mazes:
+            writer.write(maze)
+            count += 1
+    return count
+
+
+def load_mazes(path):
+    """Opens a container file, without reading its mazes.
+
+    Args:
+        path (str): The container file path.
+
+    Returns:
+        MazeReader: The container reader, which reads each maze when it is accessed.
+    """
+    return MazeReader(path)
+
+
+# **************************************************************
+#                      Search Trace Classes
+# **************************************************************
+class TraceRecorder:
+    """Search agent expansion trace recorder.
+
+    Each expansion event holds the expanded position index (y * width + x), its path cost (g), its rank (f) and the
+    frontier size, as int32 values, where -1 means the agent doesn't keep that value. The events are stored in a
+    preallocated numpy buffer. Without a file, the buffer is a ring that keeps the last events. With a file, the full
+    buffer is appended to the file each time it fills up, so every event is kept.
+
+    The trace file starts with a 16 bytes header holding the b"MZTR" magic value and the uint32 format version, maze
+    height and maze width, followed by the events.
+    """
+
+    MAGIC = b"MZTR"
+    VERSION = 1
+    EVENT_TYPE = numpy.dtype([("position", "<i4"), ("g", "<i4"), ("f", "<i4"), ("frontier", "<i4")])
+
+    def __init__(self, capacity=65536, path=None, shape=(0, 0)):
+        """Initializes the recorder buffer and creates the trace file.
+
+        Args:
+            capacity (int, optional): The number of events kept in the buffer. Defaults to 65536.
+            path (str, optional): The trace file path. Defaults to None, which keeps the events in the ring buffer.
+            shape (tuple, optional): The maze (height, width) shape, stored in the trace file header. Defaults to
+                                     (0, 0).
+        """
+        if (capacity < 1):
+            raise ValueError("The trace buffer capacity must be at least 1: " + str(capacity))
+        self._buffer = numpy.zeros(capacity, dtype=self.EVENT_TYPE)
+        self._count = 0
+        self._file = None
+        if (path != None):
+            self._file = open(path, "wb")
+            self._file.write(self.MAGIC + numpy.array([self.VERSION, shape[0], shape[1]], dtype="<u4").tobytes())
+
+    def __len__(self):
+        """Returns the number of recorded events.
+
+        Returns:
+            int: The number of events recorded since the recorder was created.
+        """
+        return self._count
+
+    def record(self, position, g=-1, f=-1, frontier=-1):
+        """Records an expansion event.
+
+        Args:
+            position (int): The expanded position index (y * width + x).
+            g (int, optional): The position path cost. Defaults to -1.
+            f (int, optional): The position rank. Defaults to -1.
+            frontier (int, optional): The frontier size. Defaults to -1.
+        """
+        index = self._count % len(self._buffer)
+        if ((index == 0) and (self._count > 0) and (self._file != None)):
+            self._file.write(self._buffer.tobytes())
+        self._buffer[index] = (position, g, f, frontier)
+        self._count += 1
+
+    def get_events(self):
+        """Returns the events kept in the buffer, from the oldest to the newest.
+
+        Returns:
+            numpy.ndarray: The events structured array, with the position, g, f and frontier fields.
+        """
+        capacity = len(self._buffer)
+        if (self._count <= capacity):
+            return self._buffer[:self._count].copy()
+        index = self._count % capacity
+        if (self._file != None):
+            return self._buffer[:(index if (index > 0) else capacity)].copy()
+        return numpy.concatenate((self._buffer[index:], self._buffer[:index]))
+
+    def close(self):
+        """Writes the buffered events to the trace file and closes it.
+        """
+        if ((self._file == None) or (self._file.closed)):
+            return
+        if (self._count > 0):
+            self._file.write(self.get_events().tobytes())
+        self._file.close()
+
+
+def load_trace(path):
+    """Reads a trace file written by a TraceRecorder.
+
+    Args:
+        path (str): The trace file path.
+
+    Returns:
+        tuple: The (shape, events) values, where shape is the maze (height, width) and events is the events structured
+               array, mapped from the file.
+    """
+    header = numpy.fromfile(path, dtype=numpy.uint8, count=16)
+    if ((len(header) < 16) or (header[:4].tobytes() != TraceRecorder.MAGIC)):
+        raise ValueError("Not a search trace file: " + str(path))
+    version, height, width = header[4:].view("<u4").tolist()
+    if (version != TraceRecorder.VERSION):
+        raise ValueError("Unsupported search trace version: " + str(version))
+    return (height, width), numpy.memmap(path, dtype=TraceRecorder.EVENT_TYPE, mode="r", offset=16)
+
+
+class TraceReplayer:
+    """Search agent expansion trace replayer.
+
+    Replays the recorded expansion events over the maze, where every expanded position is marked and the last one is
+    selected, showing the frames on screen or writing them as images.
+    """
+
+    def __init__(self, maze, events):
+        """Initializes the replayer.
+
+        Args:
+            maze (Maze): The searched maze.
+            events (numpy.ndarray): The expansion events, from TraceRecorder.get_events or load_trace.
+        """
+        self._maze = maze
+        self._events = events
+        self._width = maze.get_shape()[1]
+
+    def __len__(self):
+        """Returns the number of events in the trace.
+
+        Returns:
+            int: The number of events.
+        """
+        return len(self._events)
+
+    def frames(self, step=1):
+        """Updates the maze overlay to each replayed frame, clearing it at the end.
+
+        Args:
+            step (int, optional): The number of events shown by each frame. Defaults to 1.
+
+        Returns:
+            iterator: The frames iterator, yielding the last event of each frame.
+        """
+        self._maze.clear_path()
+        last = None
+        for start in range(0, len(self._events), step):
+            block = self._events[start:(start + step)]
+            positions = numpy.stack(numpy.divmod(block["position"].astype(numpy.intp), self._width), axis=1)
+            if (last is not None):
+                self._maze.mark_position(*last)
+            self._maze.mark_positions(positions)
+            last = positions[-1]
+            self._maze.select_position(*last)
+            yield block[-1]
+        self._maze.clear_path()
+
+    def play(self, step=1, delay=0.0, color=None, file=None):
+        """Prints the replayed frames, with the values of the last event of each frame.
+
+        Args:
+            step (int, optional): The number of events shown by each frame. Defaults to 1.
+            delay (float, optional): The pause between frames, in seconds. Defaults to 0.0.
+            color (bool, optional): Print using terminal colors. Defaults to None (see Maze.print_map).
+            file (file, optional): The output text file. Defaults to the standard output.
+        """
+        if (file == None):
+            file = sys.stdout
+        for event in self.frames(step):
+            self._maze.print_map(color, file)
+            y, x = divmod(int(event["position"]), self._width)
+            file.write("Current position = " + str([y, x]) + ", g = " + str(event["g"]) + ", f = " + str(event["f"]) +
+                       ", frontier size = " + str(event["frontier"]) + "\n")
+            if (delay > 0):
+                time.sleep(delay)
+
+    def save_images(self, path_format, step=1, scale=1):
+        """Writes the replayed frames as numbered image files.
+
+        Args:
+            path_format (str): The image file path format, filled with the frame number, such as "frame_{:05d}.png".
+            step (int, optional): The number of events shown by each frame. Defaults to 1.
+            scale (int, optional): The image pixels per map position side. Defaults to 1.
+
+        Returns:
+            int: The number of written frames.
+        """
+        count = 0
+        for _ in self.frames(step):
+            self._maze.save_image(path_format.format(count), scale)
+            count += 1
+        return count
+
+
+# **************************************************************
+#                    Search Statistics Classes
+# **************************************************************
+class SearchStats:
+    """Search agent instrumentation counters and phase timers.
+
+    The counters are updated by the agents search loops, and the same object can be given to many agents to add up
+    their counters. Each search runs in named phases, "prepare" for the agent initialization (including the dead-end
+    filling pass) and "search" for the search itself, and the time of each phase is added to phase_times.
+
+    Phase hooks are functions called as hook(agent, phase) when a phase starts, which may return a context manager that
+    is kept open until the phase ends. A cProfile.Profile or a tracemalloc section can then be attached to a phase
+    without changing the agents code, such as: stats.add_hook(lambda agent, phase: profiler if (phase == "search")
+    else None).
+
+    Attributes:
+        expanded (int): The number of positions (or search states) expanded by the search.
+        generated (int): The number of positions (or search states) added to the frontier.
+        duplicates (int): The number of positions (or search states) rejected for being already reached through a path
+                          that isn't more expensive, including the outdated frontier entries.
+        frontier_peak (int): The largest number of frontier entries (or search branch positions).
+        phase_times (dict): The total time of each phase, in seconds.
+    """
+
+    def __init__(self, hooks=()):
+        """Initializes the counters.
+
+        Args:
+            hooks (tuple, optional): The phase hook functions. Defaults to ().
+        """
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.frontier_peak = 0
+        self.phase_times = {}
+        self._hooks = list(hooks)
+
+    def add_hook(self, hook):
+        """Adds a phase hook function.
+
+        Args:
+            hook (function): The function called as hook(agent, phase) when a phase starts, returning a context
+                             manager kept open during the phase, or None.
+        """
+        self._hooks.append(hook)
+
+    @contextlib.contextmanager
+    def phase(self, name, agent):
+        """Runs a search phase, calling the phase hooks and adding up its time.
+
+        Args:
+            name (str): The phase name.
+            agent (Agent): The agent running the phase.
+
+        Returns:
+            contextmanager: The phase context, closed when the phase ends.
+        """
+        with contextlib.ExitStack() as hooks:
+            for hook in self._hooks:
+                manager = hook(agent, name)
+                if (manager != None):
+                    hooks.enter_context(manager)
+            start_time = time.perf_counter()
+            try:
+                yield self
+            finally:
+                self.phase_times[name] = self.phase_times.get(name, 0.0) + (time.perf_counter() - start_time)
+
+    def as_dict(self):
+        """Returns the counters and phase times.
+
+        Returns:
+            dict: The counter values, plus a "<phase>_ms" value for the time of each phase, in milliseconds.
+        """
+        values = {"expanded": self.expanded, "generated": self.generated, "duplicates": self.duplicates,
+                  "frontier_peak": self.frontier_peak}
+        for name, elapsed_time in self.phase_times.items():
+            values[name + "_ms"] = elapsed_time * 1000
+        return values
 
 
 # **************************************************************
@@ -346,14 +1260,50 @@ class Agent:
     """Intelligent agent base class.
     """
 
-    def __init__(self, maze):
+    # Movement directions [dy, dx], searched in the upper, lower, left and right order
+    DIRECTIONS = Maze.DIRECTIONS
+
+    def __init__(self, maze, fill_dead_ends=False, trace=None, stats=None):
         """Initializes the agent attributes.
+
+        Args:
+            maze (Maze): The maze to be solved.
+            fill_dead_ends (bool, optional): Search a working copy of the maze, where the dead-end branches are filled
+                                             with walls. Defaults to False.
+            trace (TraceRecorder, optional): The recorder of the search expansions. Defaults to None, which records
+                                             nothing unless PRINT_DEBUG is set.
+            stats (SearchStats, optional): The search counters and phase hooks. Defaults to None, which creates new
+                                           counters.
         """
-        self._maze = maze
-        self._start_position = self._maze.get_start_position()
-        self._path = numpy.array([[self._start_position[0], self._start_position[1]]])
-        self._path_length = 0
-        self._visited = numpy.array([[self._start_position[0], self._start_position[1]]])
+        # Search counters and phase timers, where the initialization is the "prepare" phase
+        self._stats = stats if (stats != None) else SearchStats()
+        with self._stats.phase("prepare", self):
+            # Number of maze positions filled by the dead-end filling pass, and the maze before the filling
+            self._removed = 0
+            self._original_maze = maze
+            if (fill_dead_ends == True):
+                maze, self._removed = maze.fill_dead_ends()
+            self._maze = maze
+            self._start_position = self._maze.get_start_position()
+            self._goal_position = self._maze.get_goal_position()
+            self._path = numpy.array([[self._start_position[0], self._start_position[1]]])
+            self._path_length = 0
+            # Visited positions bitmap, indexed by (y * width + x)
+            self._height, self._width = self._maze.get_shape()
+            self._visited = bytearray(self._height * self._width)
+            self._visit(self._start_position[0], self._start_position[1])
+            # Neighbor index of the maze positions, and the position index offsets of each direction
+            self._neighbor_mask = self._maze.get_neighbor_mask()
+            offsets = [((dy * self._width) + dx) for dy, dx in self.DIRECTIONS]
+            # Open neighbor offsets of each neighbor mask, in the directions order
+            self._open_offsets = [tuple(offsets[d] for d in range(4) if (mask & (1 << d))) for mask in range(256)]
+            # (offset, is wall) pairs of each neighbor mask, for all the neighbors inside the map
+            self._neighbor_moves = [tuple((offsets[d], int(not (mask & (1 << d))))
+                                          for d in range(4) if (mask & (16 << d))) for mask in range(256)]
+        # Recorder of the search expansions
+        if ((trace == None) and (PRINT_DEBUG == True)):
+            trace = TraceRecorder(shape=(self._height, self._width))
+        self._trace = trace
 
     # Goal test method
     def is_goal_position(self, y, x):
@@ -381,12 +1331,181 @@ class Agent:
         Returns:
             bool: The verification result, where True means the agent is new and False means other coordinates have been visited already.
         """
-        test = numpy.array([[y, x]])
-        size = numpy.shape(self._visited)
-        for i in range(size[0]):
-            if ((self._visited[i, :] == test).all()):
-                return False
-        return True
+        return (self._visited[(y * self._width) + x] == 0)
+
+    def _visit(self, y, x):
+        """Sets the input coordinate values as visited.
+
+        Args:
+            y (int): The selected position y coordinate.
+            x (int): The selected position x coordinate.
+        """
+        self._visited[(y * self._width) + x] = 1
+
+    def _goal_distance(self, index):
+        """Calculates the Manhattan distance from a position to the goal position.
+
+        Args:
+            index (int): The position index (y * width + x).
+
+        Returns:
+            int: The Manhattan distance to the goal position.
+        """
+        y, x = divmod(index, self._width)
+        return abs(self._goal_position[0] - y) + abs(self._goal_position[1] - x)
+
+    def _trace_path(self, parent, index):
+        """Rebuilds a path walking a parent position table back from the input position index.
+
+        Position indexes may be offset by multiples of the maze size (height * width), as done by search states that
+        carry extra information besides the position.
+
+        Args:
+            parent (list or dict): The parent position index of each position, indexed by (y * width + x). The
+                                   start position is its own parent.
+            index (int): The last path position index.
+
+        Returns:
+            list: The path coordinates [y, x] from the start position to the input position.
+        """
+        size = self._height * self._width
+        path = []
+        while True:
+            path.append(list(divmod((index % size), self._width)))
+            if (parent[index] == index):
+                break
+            index = int(parent[index])
+        path.reverse()
+        return path
+
+    def _trace_node_path(self, node):
+        """Rebuilds a path walking the search node parents back from the input node.
+
+        Args:
+            node (AgentSearchNode): The last path node.
+
+        Returns:
+            list: The path coordinates [y, x] from the start position to the input node position.
+        """
+        path = []
+        while (node != None):
+            path.append(list(divmod(node.position, self._width)))
+            node = node.parent
+        path.reverse()
+        return path
+
+    def _search_junction_graph(self, heuristics=None):
+        """Searches the maze junction graph, instead of the maze positions, and stores the resulting path.
+
+        The graph nodes are ranked by their path cost, plus the heuristic estimation when a heuristic function is
+        given, and the path found is expanded back into maze positions. Walls are never broken by this search.
+
+        Args:
+            heuristics (function, optional): The function that estimates the cost from the input coordinates [y, x]
+                                             to the goal. Defaults to None.
+
+        Returns:
+            bool: The search result, where True means the goal position is reached and False that it hasn't.
+        """
+        graph = self._maze.get_junction_graph()
+        goal_position = self._maze.get_goal_position()
+        start_node = (self._start_position[0] * self._width) + self._start_position[1]
+        goal_node = (goal_position[0] * self._width) + goal_position[1]
+        cost = {start_node: 0}
+        parent = {start_node: (start_node, ())}
+        explored = set()
+        frontier = HeapQueue()
+        frontier.push(0, start_node)
+        stats = self._stats
+        stats.generated += 1
+
+        # Iterate over the frontier queue
+        while (frontier):
+            if (len(frontier) > stats.frontier_peak):
+                stats.frontier_peak = len(frontier)
+            rank, current_node = frontier.pop()
+            if (current_node in explored):
+                stats.duplicates += 1
+                continue
+            explored.add(current_node)
+            stats.expanded += 1
+            if (self._trace != None):
+                self._trace.record(current_node, cost[current_node], rank, len(frontier))
+
+            # Test for goal position
+            # If True, expand the (node, corridor) steps back into the path positions
+            if (current_node == goal_node):
+                steps = []
+                while True:
+                    previous_node, corridor = parent[current_node]
+                    steps.append((current_node, corridor))
+                    if (previous_node == current_node):
+                        break
+                    current_node = previous_node
+                steps.reverse()
+                self._path = graph.expand_path(steps)
+                self._path_length = len(self._path)
+                return True
+
+            # Add the neighbor nodes reached through a cheaper path to the frontier
+            for neighbor_node, weight, corridor in graph.get_edges(current_node):
+                if (neighbor_node in explored):
+                    stats.duplicates += 1
+                    continue
+                neighbor_cost = cost[current_node] + weight
+                if ((neighbor_node not in cost) or (neighbor_cost < cost[neighbor_node])):
+                    cost[neighbor_node] = neighbor_cost
+                    parent[neighbor_node] = (current_node, corridor)
+                    neighbor_rank = neighbor_cost
+                    if (heuristics != None):
+                        neighbor_rank += heuristics(divmod(neighbor_node, self._width))
+                    frontier.push(neighbor_rank, neighbor_node)
+                    stats.generated += 1
+                else:
+                    stats.duplicates += 1
+
+        # If the frontier queue gets empty, the goal was not found
+        return False
+
+    def _trace_stack_path(self):
+        """Returns the path held by the search branch stack of [position index, next direction] frames.
+
+        Returns:
+            list: The path coordinates [y, x] from the start position to the last stack position.
+        """
+        return [list(divmod(index, self._width)) for index, _ in self._stack]
+
+    def get_trace(self):
+        """Return the recorder of the search expansions.
+
+        Returns:
+            TraceRecorder: The trace recorder, or None if the search isn't recorded.
+        """
+        return self._trace
+
+    def get_removed_count(self):
+        """Return the number of maze positions removed by the dead-end filling pass.
+
+        Returns:
+            int: The number of filled dead-end positions.
+        """
+        return self._removed
+
+    def get_expanded_count(self):
+        """Return the number of positions expanded by the agent search.
+
+        Returns:
+            int: The number of expanded positions, or search states for the agents that can break walls.
+        """
+        return self._stats.expanded
+
+    def get_stats(self):
+        """Return the search counters and phase timers.
+
+        Returns:
+            SearchStats: The agent search statistics.
+        """
+        return self._stats
 
     def get_path(self):
         """Return the agent mapped path
@@ -400,7 +1519,9 @@ class Agent:
 class BFS_Search(Agent):
     """Breadth-First Search Method
 
-    This class implements the Breadth-First Search algorithm.
+    This class implements the Breadth-First Search algorithm. The frontier is kept in a FIFO queue and each position is
+    expanded only once, storing its parent position so the path can be rebuilt when the goal is reached. The
+    bidirectional mode searches from the start and goal positions at the same time, until both searches meet.
 
     Args:
         Agent (object): The search algorithm intelligent agent parent class.
@@ -409,124 +1530,157 @@ class BFS_Search(Agent):
         object: The BFS agent object.
     """
 
-    _level = 1
-    _current_level = 0
-
-    def __init__(self, maze):
+    def __init__(self, maze, fill_dead_ends=False, bidirectional=False, trace=None, stats=None):
         """Initialize the search agent and execute.
+
+        Args:
+            maze (Maze): The maze to be solved.
+            fill_dead_ends (bool, optional): Fill the maze dead ends before the search. Defaults to False.
+            bidirectional (bool, optional): Search from the start and goal positions at the same time. Defaults to
+                                            False.
+            trace (TraceRecorder, optional): The recorder of the search expansions. Defaults to None.
+            stats (SearchStats, optional): The search counters and phase hooks. Defaults to None.
         """
         # Initialization process
-        Agent.__init__(self, maze)
+        Agent.__init__(self, maze, fill_dead_ends, trace, stats)
+        # Parent position index of each visited position, indexed by (y * width + x)
+        self._parent = [-1] * (self._height * self._width)
+        self._frontier = deque()
         # Execute the search
-        self.move(self._start_position[0], self._start_position[1])
-
-    def move(self, y, x):
-        """Agent movement method.
+        with self._stats.phase("search", self):
+            if (bidirectional == True):
+                self._search_bidirectional()
+            else:
+                self._search()
 
-        Args:
-            y (int): The selected position y coordinate.
-            x (int): The selected position x coordinate.
+    def _search(self):
+        """Agent search method.
 
         Returns:
-            bool: The movement result, where True means the goal position is reached and False that it hasn't.
+            bool: The search result, where True means the goal position is reached and False that it hasn't.
         """
 
-        # Update current coordinate
-        current = numpy.array([[y, x]])
-        # Update the visited positions list
-        if ((current != self._start_position).any()):
-            self._visited = numpy.concatenate((self._visited, current), axis=0)
-
-        # Check if current level belongs to the level under analysis
-        if (self._current_level == self._level):
-
-            # Print current movement step
-            if (PRINT_DEBUG == True):
-                self._maze.mark_position(y, x)
-                self._maze.print_map()
-                print("Current level = ", self._current_level)
-                print("Current position = ", current)
-                print("Current search level = ", self._level)
-                input("PRESS ANY KEY TO CONTINUE...")
-                self._maze.clear_path()
-
-            # Test for goal position
-            # Return True if it is the goal position
-            if (self.is_goal_position(y, x) == True):
-                self._path = self._visited
-                return True
-
-        # If the current position isn't the goal,
-        # Check the need to go for the next level
-        if (self._current_level < self._level):
-
-            self._current_level += 1
+        # Insert the start position in the frontier queue
+        start_index = (self._start_position[0] * self._width) + self._start_position[1]
+        self._parent[start_index] = start_index
+        self._frontier.append(start_index)
+        stats = self._stats
+        stats.generated += 1
 
-            # Search on upper coordinate
-            # Check if the position is part of an path,
-            if (self._maze.get_position_value((y + 1), x) != 1):
-                if (self.is_agent_new((y + 1), x)):
+        # Iterate over the frontier queue
+        while (self._frontier):
 
-                    # Move to this coordinate.
-                    # If this action returns True, the goal was found.
-                    # Save the current coordinate as part of the path and return True
-                    if (self.move((y + 1), x)):
-                        return True
+            # Remove the oldest position from the queue
+            if (len(self._frontier) > stats.frontier_peak):
+                stats.frontier_peak = len(self._frontier)
+            current_index = self._frontier.popleft()
+            stats.expanded += 1
+            y, x = divmod(current_index, self._width)
 
-            # Search on lower coordinate
-            # If the position is part of an path,
-            if (self._maze.get_position_value((y - 1), x) != 1):
-                if (self.is_agent_new((y - 1), x)):
+            # Record current movement step
+            if (self._trace != None):
+                self._trace.record(current_index, -1, -1, len(self._frontier))
 
-                    # Move to this coordinate.
-                    # If this action returns True, the goal was found.
-                    # Save the current coordinate as part of the path and return True
-                    if (self.move((y - 1), x)):
-                        return True
-
-            # Search on lower coordinate
-            # If the position is part of an path,
-            if (self._maze.get_position_value(y, (x - 1)) != 1):
-                if (self.is_agent_new(y, (x - 1))):
+            # Test for goal position
+            # If True, rebuild the path from the parent positions and return True
+            if (self.is_goal_position(y, x)):
+                self._path = numpy.array(self._trace_path(self._parent, current_index))
+                self._path_length = len(self._path)
+                return True
 
-                    # Move to this coordinate.
-                    # If this action returns True, the goal was found.
-                    # Save the current coordinate as part of the path and return True
-                    if (self.move(y, (x - 1))):
-                        return True
+            # If the current position isn't the goal, add the new open neighbor positions to the frontier queue
+            for offset in self._open_offsets[self._neighbor_mask[current_index]]:
+                neighbor_index = current_index + offset
+                if (self._visited[neighbor_index] == 0):
+                    self._visited[neighbor_index] = 1
+                    self._parent[neighbor_index] = current_index
+                    self._frontier.append(neighbor_index)
+                    stats.generated += 1
+                else:
+                    stats.duplicates += 1
 
-            # Search on lower coordinate
-            # If the position is part of an path,
-            if (self._maze.get_position_value(y, (x + 1)) != 1):
-                if (self.is_agent_new(y, (x + 1))):
+        # If the frontier queue gets empty, the goal was not found
+        return False
 
-                    # Move to this coordinate.
-                    # If this action returns True, the goal was found.
-                    # Save the current coordinate as part of the path and return True
-                    if (self.move(y, (x + 1))):
-                        return True
+    def _search_bidirectional(self):
+        """Agent bidirectional search method.
 
-            # If none of its sons is part of path,
-            # This node is removed from path and return false.
-            self._current_level -= 1
+        Runs one breadth-first search from the start position and another from the goal position, always expanding a
+        whole level of the side with the smaller frontier. When a level reaches positions already visited by the other
+        side, the shortest connection found in that level joins both searches into the path.
 
-        # In case this is the first movement action, go to the next level
-        if ((current == self._start_position).all()):
-            self._level += 1
-            self._visited = current
-            self.move(self._start_position[0], self._start_position[1])
+        Returns:
+            bool: The search result, where True means the goal position is reached and False that it hasn't.
+        """
+        size = self._height * self._width
+        goal_position = self._maze.get_goal_position()
+        start_index = (self._start_position[0] * self._width) + self._start_position[1]
+        goal_index = (goal_position[0] * self._width) + goal_position[1]
+
+        # Search tables of the start (0) and goal (1) sides
+        parents = (self._parent, [-1] * size)
+        distances = ([-1] * size, [-1] * size)
+        frontiers = (self._frontier, deque())
+        for side, index in ((0, start_index), (1, goal_index)):
+            parents[side][index] = index
+            distances[side][index] = 0
+            frontiers[side].append(index)
+        stats = self._stats
+        stats.generated += 2
+
+        # Iterate while both frontier queues have positions
+        while (frontiers[0] and frontiers[1]):
+            if (len(frontiers[0]) + len(frontiers[1]) > stats.frontier_peak):
+                stats.frontier_peak = len(frontiers[0]) + len(frontiers[1])
+            side = 0 if (len(frontiers[0]) <= len(frontiers[1])) else 1
+            frontier, parent, distance = frontiers[side], parents[side], distances[side]
+            other_distance = distances[1 - side]
+            meeting = None
+
+            # Expand a whole level of the selected side
+            for _ in range(len(frontier)):
+                current_index = frontier.popleft()
+                stats.expanded += 1
+
+                # Record current movement step
+                if (self._trace != None):
+                    self._trace.record(current_index, distance[current_index], -1, len(frontier))
+
+                for offset in self._open_offsets[self._neighbor_mask[current_index]]:
+                    neighbor_index = current_index + offset
+                    # Check if the other side already reached this neighbor, keeping the shortest connection
+                    if (other_distance[neighbor_index] >= 0):
+                        length = distance[current_index] + 1 + other_distance[neighbor_index]
+                        if ((meeting == None) or (length < meeting[0])):
+                            meeting = (length, current_index, neighbor_index)
+                    if (distance[neighbor_index] < 0):
+                        distance[neighbor_index] = distance[current_index] + 1
+                        parent[neighbor_index] = current_index
+                        frontier.append(neighbor_index)
+                        stats.generated += 1
+                    else:
+                        stats.duplicates += 1
+
+            # Join the paths of both sides at the shortest connection
+            if (meeting != None):
+                _, current_index, neighbor_index = meeting
+                if (side == 1):
+                    current_index, neighbor_index = neighbor_index, current_index
+                path = self._trace_path(parents[0], current_index)
+                path.extend(reversed(self._trace_path(parents[1], neighbor_index)))
+                self._path = numpy.array(path)
+                self._path_length = len(self._path)
+                return True
 
-        # Lastly, at this point we know this position is not part of the path
-        # This node is removed from path and return false.
-        else:
-            self._visited = numpy.delete(self._visited, (numpy.shape(self._visited)[0] - 1), axis=0)
-            return False
+        # If a frontier queue gets empty, the goal was not found
+        return False
 
 
 class DFS_Search(Agent):
     """Depth-First Search Method
 
-    This class implements the Depth-First Search algorithm.
+    This class implements the Depth-First Search algorithm. The search branch is kept in an explicit stack of
+    [position index, next direction] frames, so the search depth is not bounded by the Python recursion limit.
 
     Args:
         Agent (object): The search algorithm intelligent agent parent class.
@@ -535,106 +1689,97 @@ class DFS_Search(Agent):
         object: The DFS agent object.
     """
 
-    def __init__(self, maze):
+    def __init__(self, maze, fill_dead_ends=False, trace=None, stats=None):
         """Initialize the search agent and execute.
+
+        Args:
+            maze (Maze): The maze to be solved.
+            fill_dead_ends (bool, optional): Fill the maze dead ends before the search. Defaults to False.
+            trace (TraceRecorder, optional): The recorder of the search expansions. Defaults to None.
+            stats (SearchStats, optional): The search counters and phase hooks. Defaults to None.
         """
         # Initialization process
-        Agent.__init__(self, maze)
+        Agent.__init__(self, maze, fill_dead_ends, trace, stats)
+        self._stack = []
         # Execute the search
-        self.move(self._start_position[0], self._start_position[1])
-
-    def move(self, y, x):
-        """Agent movement method.
+        with self._stats.phase("search", self):
+            self._search()
 
-        Args:
-            y (int): The selected position y coordinate.
-            x (int): The selected position x coordinate.
+    def _search(self):
+        """Agent search method.
 
         Returns:
-            bool: The movement result, where True means the goal position is reached and False that it hasn't.
+            bool: The search result, where True means the goal position is reached and False that it hasn't.
         """
 
-        # Update current coordinate
-        current = numpy.array([[y, x]])
-        # Update the visited positions list
-        self._visited = numpy.concatenate((self._visited, current), axis=0)
-
-        # Print current movement step
-        if (PRINT_DEBUG == True):
-            self._maze.mark_position(y, x)
-            self._maze.print_map()
-            print("Current position = ", current)
-            input("PRESS ANY KEY TO CONTINUE...")
-            self._maze.clear_path()
-
-        # Test for goal position
-        # If True, set path and return True
-        if (self.is_goal_position(y, x)):
-            self._path = numpy.array([[y, x]])
+        # Start the search branch at the start position
+        start_index = (self._start_position[0] * self._width) + self._start_position[1]
+        self._stack.append([start_index, 0])
+        if (self.move(self._start_position[0], self._start_position[1])):
+            self._path = numpy.array(self._trace_stack_path())
             return True
 
-        # If the current position isn't the goal,
+        # Iterate over the search branch
+        while (self._stack):
+            frame = self._stack[-1]
+            index, direction = frame
+            offsets = self._open_offsets[self._neighbor_mask[index]]
 
-        # Search on upper coordinate
-        # Check if the position is part of an path,
-        if (self._maze.get_position_value((y + 1), x) != 1):
-            if (self.is_agent_new((y + 1), x)):
+            # If all directions were already searched, this position is not part of the path
+            if (direction == len(offsets)):
+                self._stack.pop()
+                continue
+
+            # Search on the next open direction
+            frame[1] += 1
+            neighbor_index = index + offsets[direction]
+            if (self._visited[neighbor_index] != 0):
+                self._stats.duplicates += 1
+            else:
 
                 # Move to this coordinate.
-                # If this action returns True, the goal was found.
-                # Save the current coordinate as part of the path and return True
-                if (self.move((y + 1), x)):
-                    pos = numpy.array([[y, x]])
-                    self._path = numpy.concatenate((pos, self._path), axis=0)
+                # If this action returns True, the goal was found and the search branch is the path.
+                self._stack.append([neighbor_index, 0])
+                if (self.move(*divmod(neighbor_index, self._width))):
+                    self._path = numpy.array(self._trace_stack_path())
                     return True
 
-        # Search on lower coordinate
-        # If the position is part of an path,
-        if (self._maze.get_position_value((y - 1), x) != 1):
-            if (self.is_agent_new((y - 1), x)):
+        # If the search branch gets empty, the goal was not found
+        return False
 
-                # Move to this coordinate.
-                # If this action returns True, the goal was found.
-                # Save the current coordinate as part of the path and return True
-                if (self.move((y - 1), x)):
-                    pos = numpy.array([[y, x]])
-                    self._path = numpy.concatenate((pos, self._path), axis=0)
-                    return True
+    def move(self, y, x):
+        """Agent movement method.
 
-        # Search on left coordinate
-        # If the position is part of an path,
-        if (self._maze.get_position_value(y, (x - 1)) != 1):
-            if (self.is_agent_new(y, (x - 1))):
+        Args:
+            y (int): The selected position y coordinate.
+            x (int): The selected position x coordinate.
 
-                # Move to this coordinate.
-                # If this action returns True, the goal was found.
-                # Save the current coordinate as part of the path and return True
-                if (self.move(y, (x - 1))):
-                    pos = numpy.array([[y, x]])
-                    self._path = numpy.concatenate((pos, self._path), axis=0)
-                    return True
+        Returns:
+            bool: The movement result, where True means the goal position is reached and False that it hasn't.
+        """
 
-        # Search on right coordinate
-        # If the position is part of an path,
-        if (self._maze.get_position_value(y, (x + 1)) != 1):
-            if (self.is_agent_new(y, (x + 1))):
+        # Update the visited positions list and the counters, where the search branch is the frontier
+        self._visit(y, x)
+        stats = self._stats
+        stats.expanded += 1
+        stats.generated += 1
+        if (len(self._stack) > stats.frontier_peak):
+            stats.frontier_peak = len(self._stack)
 
-                # Move to this coordinate.
-                # If this action returns True, the goal was found.
-                # Save the current coordinate as part of the path and return True
-                if (self.move(y, (x + 1))):
-                    pos = numpy.array([[y, x]])
-                    self._path = numpy.concatenate((pos, self._path), axis=0)
-                    return True
+        # Record current movement step
+        if (self._trace != None):
+            self._trace.record(((y * self._width) + x), (len(self._stack) - 1), -1, len(self._stack))
 
-        # If none of its neighbors is part of path, return false
-        return False
+        # Test for goal position
+        return self.is_goal_position(y, x)
 
 
 class IDFS_Search(Agent):
     """Iterative Depth-First Search Method
 
-    This class implements the Iterative Depth-First Search algorithm.
+    This class implements the Iterative Depth-First Search algorithm. Each iteration runs a depth-limited search, with
+    the search branch kept in an explicit stack of [position index, next direction] frames, and the depth limit is
+    increased until the goal is found or no position was left unexplored by the limit.
 
     Args:
         Agent (object): The search algorithm intelligent agent parent class.
@@ -643,129 +1788,263 @@ class IDFS_Search(Agent):
         object: The IDFS agent object.
     """
 
-    _level = 1
-    _current_level = 0
-
-    def __init__(self, maze):
+    def __init__(self, maze, fill_dead_ends=False, trace=None, stats=None):
         """Initialize the search agent and execute.
+
+        Args:
+            maze (Maze): The maze to be solved.
+            fill_dead_ends (bool, optional): Fill the maze dead ends before the search. Defaults to False.
+            trace (TraceRecorder, optional): The recorder of the search expansions. Defaults to None.
+            stats (SearchStats, optional): The search counters and phase hooks. Defaults to None.
         """
         # Initialization process
-        Agent.__init__(self, maze)
+        Agent.__init__(self, maze, fill_dead_ends, trace, stats)
+        self._level = 1
+        self._stack = []
         # Execute the search
-        self.move(self._start_position[0], self._start_position[1])
+        with self._stats.phase("search", self):
+            self._search()
 
-    def move(self, y, x):
+    def _search(self):
+        """Agent search method.
+
+        Returns:
+            bool: The search result, where True means the goal position is reached and False that it hasn't.
+        """
+
+        # Test the start position
+        start_index = (self._start_position[0] * self._width) + self._start_position[1]
+        if (self.move(self._start_position[0], self._start_position[1])):
+            self._path = numpy.array([self._start_position])
+            return True
+
+        # Increase the search level until the goal is found
+        while True:
+
+            # Start the search branch at the start position
+            self._stack.append([start_index, 0])
+            cutoff = False
+
+            # Iterate over the search branch
+            while (self._stack):
+                frame = self._stack[-1]
+                index, direction = frame
+                offsets = self._open_offsets[self._neighbor_mask[index]]
+
+                # If all directions were already searched or the branch reached the search level,
+                # this position is removed from the branch
+                if ((direction == len(offsets)) or (len(self._stack) > self._level)):
+                    if (direction < len(offsets)):
+                        cutoff = True
+                    self._stack.pop()
+                    if (self._stack):
+                        self._visited[index] = 0
+                    continue
+
+                # Search on the next open direction
+                frame[1] += 1
+                neighbor_index = index + offsets[direction]
+                if (self._visited[neighbor_index] != 0):
+                    self._stats.duplicates += 1
+                else:
+
+                    # Move to this coordinate.
+                    # If this action returns True, the goal was found and the search branch is the path.
+                    self._stack.append([neighbor_index, 0])
+                    if (self.move(*divmod(neighbor_index, self._width))):
+                        self._path = numpy.array(self._trace_stack_path())
+                        return True
+
+            # If no branch was cut by the search level, the goal can't be reached
+            if (cutoff == False):
+                return False
+            self._level += 1
+
+    def move(self, y, x, rank=-1):
         """Agent movement method.
 
         Args:
             y (int): The selected position y coordinate.
             x (int): The selected position x coordinate.
+            rank (int, optional): The position rank, recorded in the search trace. Defaults to -1.
+
+        Returns:
+            bool: The movement result, where True means the goal position is reached and False that it hasn't.
+        """
+
+        # Update the visited positions list and the counters, where the search branch is the frontier
+        self._visit(y, x)
+        stats = self._stats
+        stats.expanded += 1
+        stats.generated += 1
+        if (len(self._stack) > stats.frontier_peak):
+            stats.frontier_peak = len(self._stack)
+
+        # Record current movement step
+        if (self._trace != None):
+            self._trace.record(((y * self._width) + x), max(0, (len(self._stack) - 1)), rank, len(self._stack))
+
+        # Test for goal position
+        # Return True if it is the goal position
+        return self.is_goal_position(y, x)
+
+
+class IDAStar_Search(IDFS_Search):
+    """Iterative Deepening A* Search Method
+
+    This class implements the Iterative Deepening A* Search algorithm. It keeps the iterative deepening structure of
+    the IDFS agent, but each iteration bounds the search branch on the path cost plus the Manhattan distance to the goal
+    position, instead of the branch depth, and the next bound is the lowest value that exceeded the current one. Only
+    the search branch is kept between steps, so the memory grows with the path length instead of the explored area,
+    and the first path found is optimal. Since positions are only checked against the search branch, open areas
+    repeat the search over many equivalent paths, so this agent is meant for corridor mazes that must be solved with
+    little memory, and it is not part of the default agents.
+
+    Args:
+        IDFS_Search (object): The Iterative Depth-First Search agent class.
+
+    Returns:
+        object: The IDA* agent object.
+    """
+
+    def _search(self):
+        """Agent search method.
+
+        The search level holds the current bound of the path cost plus the heuristic estimation, and the visited
+        positions are the ones in the search branch.
+
+        Returns:
+            bool: The search result, where True means the goal position is reached and False that it hasn't.
+        """
+
+        # Test the start position
+        start_index = (self._start_position[0] * self._width) + self._start_position[1]
+        if (self.move(self._start_position[0], self._start_position[1], self._goal_distance(start_index))):
+            self._path = numpy.array([self._start_position])
+            return True
+
+        # Increase the search bound until the goal is found
+        self._level = self._goal_distance(start_index)
+        while True:
+
+            # Start the search branch at the start position
+            self._stack.append([start_index, 0])
+            next_level = None
+
+            # Iterate over the search branch
+            while (self._stack):
+                frame = self._stack[-1]
+                index, direction = frame
+                offsets = self._open_offsets[self._neighbor_mask[index]]
+
+                # If all directions were already searched, this position is removed from the branch
+                if (direction == len(offsets)):
+                    self._stack.pop()
+                    if (self._stack):
+                        self._visited[index] = 0
+                    continue
+
+                # Search on the next open direction, if it isn't in the branch
+                frame[1] += 1
+                neighbor_index = index + offsets[direction]
+                if (self._visited[neighbor_index] != 0):
+                    self._stats.duplicates += 1
+                    continue
 
-        Returns:
-            bool: The movement result, where True means the goal position is reached and False that it hasn't.
-        """
+                # Keep the lowest bound that cuts the branch for the next iteration
+                rank = len(self._stack) + self._goal_distance(neighbor_index)
+                if (rank > self._level):
+                    if ((next_level == None) or (rank < next_level)):
+                        next_level = rank
+                    continue
 
-        # Update current coordinate
-        current = numpy.array([[y, x]])
-        # Update the visited positions list
-        if ((current != self._start_position).any()):
-            self._visited = numpy.concatenate((self._visited, current), axis=0)
+                # Move to this coordinate.
+                # If this action returns True, the goal was found and the search branch is the path.
+                self._stack.append([neighbor_index, 0])
+                if (self.move(*divmod(neighbor_index, self._width), rank)):
+                    self._path = numpy.array(self._trace_stack_path())
+                    return True
 
-        # Test for goal position
-        # Return True if it is the goal position
-        if (self.is_goal_position(y, x)):
-            self._path = self._visited
-            return True
+            # If no branch was cut by the search bound, the goal can't be reached
+            if (next_level == None):
+                return False
+            self._level = next_level
 
-        # Print current movement step
-        if (PRINT_DEBUG == True):
-            self._maze.mark_position(y, x)
-            self._maze.print_map()
-            print("Current level = ", self._current_level)
-            print("Current position = ", current)
-            print("Current search level = ", self._level)
-            input("PRESS ANY KEY TO CONTINUE...")
-            self._maze.clear_path()
 
-        # If current position isn't the goal,
-        # Check the need to go for the next level
-        if (self._current_level < self._level):
+class HeapQueue:
+    """Search frontier priority queue.
 
-            self._current_level += 1
+    This class implements a binary heap priority queue for the search agents, with no thread synchronization. Items
+    are stored in (rank, sequence, item) tuples, so the heap only compares integer values and items with the same rank
+    are removed in the reverse insertion order.
+    """
 
-            # Search on upper coordinate
-            # Check if the position is part of an path,
-            if (self._maze.get_position_value((y + 1), x) != 1):
-                if (self.is_agent_new((y + 1), x)):
+    def __init__(self):
+        """Initializes the queue attributes.
+        """
+        self._heap = []
+        self._sequence = 0
 
-                    # Move to this coordinate.
-                    # If this action returns True, the goal was found.
-                    # Save the current coordinate as part of the path and return True
-                    if (self.move((y + 1), x)):
-                        return True
+    def __len__(self):
+        """Returns the number of items in the queue.
 
-            # Search on lower coordinate
-            # If the position is part of an path,
-            if (self._maze.get_position_value((y - 1), x) != 1):
-                if (self.is_agent_new((y - 1), x)):
+        Returns:
+            int: The number of items in the queue.
+        """
+        return len(self._heap)
 
-                    # Move to this coordinate.
-                    # If this action returns True, the goal was found.
-                    # Save the current coordinate as part of the path and return True
-                    if (self.move((y - 1), x)):
-                        return True
+    def __iter__(self):
+        """Iterates over the queue items, without removing them.
 
-            # Search on left coordinate
-            # If the position is part of an path,
-            if (self._maze.get_position_value(y, (x - 1)) != 1):
-                if (self.is_agent_new(y, (x - 1))):
+        Returns:
+            iterator: The queue items iterator, in no particular order.
+        """
+        for _, _, item in self._heap:
+            yield item
 
-                    # Move to this coordinate.
-                    # If this action returns True, the goal was found.
-                    # Save the current coordinate as part of the path and return True
-                    if (self.move(y, (x - 1))):
-                        return True
+    def push(self, rank, item):
+        """Inserts an item in the queue.
 
-            # Search on right coordinate
-            # If the position is part of an path,
-            if (self._maze.get_position_value(y, (x + 1)) != 1):
-                if (self.is_agent_new(y, (x + 1))):
+        Args:
+            rank (int): The item rank, where lower ranks are removed first.
+            item (object): The inserted item.
+        """
+        self._sequence -= 1
+        heapq.heappush(self._heap, (rank, self._sequence, item))
 
-                    # Move to this coordinate.
-                    # If this action returns True, the goal was found.
-                    # Save the current coordinate as part of the path and return True
-                    if (self.move(y, (x + 1))):
-                        return True
+    def pop(self):
+        """Removes the lowest ranking item from the queue.
 
-            # If none of its sons is part of path,
-            # This node is removed from path and return false.
-            self._current_level -= 1
+        Returns:
+            tuple: The (rank, item) values of the removed item.
+        """
+        rank, _, item = heapq.heappop(self._heap)
+        return rank, item
 
-        # In case this is the first movement action, go to the next level
-        if ((current == self._start_position).all()):
-            self._level += 1
-            self._visited = current
-            self.move(self._start_position[0], self._start_position[1])
+    def peek(self):
+        """Returns the lowest ranking item of the queue, without removing it.
 
-        # Lastly, at this point we know this position is not part of the path
-        # This node is removed from path and return false.
-        else:
-            self._visited = numpy.delete(self._visited, (numpy.shape(self._visited)[0] - 1), axis=0)
-            return False
+        Returns:
+            tuple: The (rank, item) values of the lowest ranking item.
+        """
+        rank, _, item = self._heap[0]
+        return rank, item
 
 
 class AgentSearchNode:
     """Agent Search Method node.
 
-    This class represents a node in the A* search path.
+    This class represents a node in the search path. Nodes only keep a reference to their parent node, so the path can
+    be rebuilt walking back from the last node, and the position is packed as an integer index (y * width + x).
     """
 
-    def __init__(self, parent, rank, cost, position, path, break_wall):
+    __slots__ = ("parent", "rank", "cost", "position", "break_wall")
+
+    def __init__(self, parent, rank, cost, position, break_wall):
         self.parent = parent
         self.rank = rank
         self.cost = cost
         self.position = position
-        self.agent_path = path
         self.break_wall = break_wall
 
     def __cmp__(self, other):
@@ -836,25 +2115,47 @@ class DijkstraAgent(Agent):
         object: The Dijkstra agent object.
     """
 
-    def __init__(self, maze, return_first=True, break_wall=0):
-        """Initialize the search agent and execute.
+    def __init__(self, maze, return_first=True, break_wall=0, junctions=False, fill_dead_ends=False, trace=None,
+                 stats=None):
+        """Initialize the search agent.
+
+        Args:
+            maze (Maze): The maze to be solved.
+            return_first (bool, optional): Stop the search at the first path found. Defaults to True.
+            break_wall (int, optional): The number of walls the agent can break. Defaults to 0.
+            junctions (bool, optional): Search the maze junction graph instead of the maze positions, when no wall can
+                                        be broken. Defaults to False.
+            fill_dead_ends (bool, optional): Fill the maze dead ends before the search, when no wall can be broken,
+                                             since broken walls could lead through the dead ends. Defaults to False.
+            trace (TraceRecorder, optional): The recorder of the search expansions. Defaults to None.
+            stats (SearchStats, optional): The search counters and phase hooks. Defaults to None.
         """
         # Initialization process
-        Agent.__init__(self, maze)
+        Agent.__init__(self, maze, (fill_dead_ends and (break_wall == 0)), trace, stats)
         self._path = []
-        self._goal_position = self._maze.get_goal_position()
-        self._frontier = queue.PriorityQueue()
-        self._explored = set()
+        self._frontier = HeapQueue()
         self._return_first = return_first
         self._break_wall = break_wall
+        self._junctions = junctions
+        # Dense search state tables, shaped (break_wall + 1, height, width) and indexed by the encoded states
+        self._cost = [-1] * ((break_wall + 1) * self._height * self._width)
+        self._explored = bytearray((break_wall + 1) * self._height * self._width)
+        self._source_position = None
+        self._distance = None
+        self._predecessor = None
+        self._break_distance = None
+        self._break_predecessor = None
 
     def start(self):
         """Method that starts the goal search process and returns the resulting path.
         """
         # Execute the search
-        start_node = AgentSearchNode(0, 0, self._heuristics(self._start_position), self._start_position,
-                                     [self._start_position], self._break_wall)
-        return self._search(start_node)
+        with self._stats.phase("search", self):
+            if ((self._junctions == True) and (self._break_wall == 0)):
+                return self._search_junction_graph()
+            start_index = (self._start_position[0] * self._width) + self._start_position[1]
+            start_node = AgentSearchNode(None, 0, 0, start_index, self._break_wall)
+            return self._search(start_node)
 
     def _movement_cost(self, origin=[], destination=[]):
         """Agent heuristic function that calculates movement costs.
@@ -887,11 +2188,144 @@ class DijkstraAgent(Agent):
         """
         return self._movement_cost(coordinates, self._goal_position)
 
+    def compute_distances(self, source=None):
+        """Computes the distance and predecessor of every maze position from the source position.
+
+        Runs a single Dijkstra sweep from the source position. Since every movement has the same cost, the frontier is
+        kept in a FIFO queue. Walls are never broken by the sweep. Once it is computed, the path to any goal position
+        can be extracted using the get_path_to method, without searching the maze again. The sweep always runs over the
+        original maze, since the dead ends filled for the start and goal positions may lead to other goal positions.
+
+        Args:
+            source (list, optional): The source position coordinates [y, x]. Defaults to the start position.
+
+        Returns:
+            tuple: The (distance, predecessor) numpy int32 arrays, shaped like the maze. The distance holds the number
+                   of movements from the source position and the predecessor holds the previous position index
+                   (y * width + x) in the path. Both hold -1 for positions that can't be reached.
+        """
+        if (source is None):
+            source = self._start_position
+        size = self._height * self._width
+        distance = [-1] * size
+        predecessor = [-1] * size
+
+        # Insert the source position in the frontier queue
+        source_index = (source[0] * self._width) + source[1]
+        distance[source_index] = 0
+        predecessor[source_index] = source_index
+        frontier = deque([source_index])
+        neighbor_mask = self._original_maze.get_neighbor_mask()
+
+        # Iterate over the frontier queue
+        while (frontier):
+            current_index = frontier.popleft()
+            neighbor_distance = distance[current_index] + 1
+            for offset in self._open_offsets[neighbor_mask[current_index]]:
+                neighbor_index = current_index + offset
+                if (distance[neighbor_index] < 0):
+                    distance[neighbor_index] = neighbor_distance
+                    predecessor[neighbor_index] = current_index
+                    frontier.append(neighbor_index)
+
+        # Store the distance field
+        shape = (self._height, self._width)
+        self._source_position = [int(source[0]), int(source[1])]
+        self._distance = numpy.array(distance, dtype=numpy.int32).reshape(shape)
+        self._predecessor = numpy.array(predecessor, dtype=numpy.int32).reshape(shape)
+        return self._distance, self._predecessor
+
+    def compute_break_distances(self, source=None):
+        """Computes the distance and predecessor of every search state from the source position, breaking walls.
+
+        Runs a single breadth-first sweep over the layered search states, where each layer holds the maze positions
+        reached with a given number of walls the agent can still break. The sweep starts at the source position with
+        break_wall walls left and moving into a wall moves the agent to the layer below.
+
+        Args:
+            source (list, optional): The source position coordinates [y, x]. Defaults to the start position.
+
+        Returns:
+            tuple: The (distance, predecessor) numpy int32 arrays, shaped (break_wall + 1, height, width). The distance
+                   holds the number of movements from the source position and the predecessor holds the previous
+                   search state (break_wall * height * width) + (y * width + x) in the path. Both hold -1 for states
+                   that can't be reached.
+        """
+        if (source is None):
+            source = self._start_position
+        size = self._height * self._width
+        distance = [-1] * ((self._break_wall + 1) * size)
+        predecessor = [-1] * ((self._break_wall + 1) * size)
+
+        # Insert the source state in the frontier queue
+        source_state = (self._break_wall * size) + (source[0] * self._width) + source[1]
+        distance[source_state] = 0
+        predecessor[source_state] = source_state
+        frontier = deque([source_state])
+        neighbor_mask = self._original_maze.get_neighbor_mask()
+
+        # Iterate over the frontier queue
+        while (frontier):
+            current_state = frontier.popleft()
+            current_break_wall, current_index = divmod(current_state, size)
+            neighbor_distance = distance[current_state] + 1
+            for offset, is_wall in self._neighbor_moves[neighbor_mask[current_index]]:
+                if (current_break_wall < is_wall):
+                    continue
+                neighbor_state = current_state + offset - (is_wall * size)
+                if (distance[neighbor_state] < 0):
+                    distance[neighbor_state] = neighbor_distance
+                    predecessor[neighbor_state] = current_state
+                    frontier.append(neighbor_state)
+
+        # Store the distance field
+        shape = ((self._break_wall + 1), self._height, self._width)
+        self._source_position = [int(source[0]), int(source[1])]
+        self._break_distance = numpy.array(distance, dtype=numpy.int32).reshape(shape)
+        self._break_predecessor = numpy.array(predecessor, dtype=numpy.int32).reshape(shape)
+        return self._break_distance, self._break_predecessor
+
+    def get_path_to(self, goal=None):
+        """Returns the path from the source position to the goal position using the computed distance field.
+
+        The distance field is computed from the start position if compute_distances wasn't called yet. Agents that can
+        break walls use the compute_break_distances field instead, ending at the layer closest to the goal.
+
+        Args:
+            goal (list, optional): The goal position coordinates [y, x]. Defaults to the maze goal position.
+
+        Returns:
+            list: The path coordinates [y, x] from the source position to the goal, or an empty list if the goal can't
+                  be reached.
+        """
+        if (goal is None):
+            goal = self._goal_position
+        index = (goal[0] * self._width) + goal[1]
+        if (self._break_wall > 0):
+            if (self._break_predecessor is None):
+                self.compute_break_distances()
+            # Pick the reached layer with the shortest distance to the goal
+            distance = self._break_distance[:, goal[0], goal[1]]
+            if (distance.max() < 0):
+                return []
+            layer = int(numpy.where((distance >= 0), distance, distance.max() + 1).argmin())
+            return self._trace_path(self._break_predecessor.reshape(-1), ((layer * self._height * self._width) + index))
+        if (self._predecessor is None):
+            self.compute_distances()
+        predecessor = self._predecessor.reshape(-1)
+        if (predecessor.item(index) < 0):
+            return []
+        return self._trace_path(predecessor, index)
+
     def _search(self, node):
         """Agent search method.
 
+        Each search state is a maze position combined with the number of walls the agent can still break. States are
+        encoded as (break_wall * height * width) + (y * width + x), indexing the dense cost and explored tables of
+        (break_wall + 1) layers, and each state is expanded only once.
+
         Args:
-            node (AgentSearchNode): current A* node used in the search process.
+            node (AgentSearchNode): current Dijkstra node used in the search process.
 
         Returns:
             bool: The movement result, where True means the goal position is reached and False that it hasn't.
@@ -899,33 +2333,44 @@ class DijkstraAgent(Agent):
 
         # Rename the input node
         current_node = node
+        size = self._height * self._width
         # Update the visited positions list
-        self._frontier.put(current_node)
+        self._cost[(current_node.break_wall * size) + current_node.position] = current_node.cost
+        self._frontier.push(current_node.rank, current_node)
+        stats = self._stats
+        stats.generated += 1
 
         # Iterate over the frontier queue
-        while (not self._frontier.empty()):
+        while (self._frontier):
 
             # Remove the lowest ranking node from the queue
-            current_node = self._frontier.get()
-            current_position = current_node.position
-
-            # Include current node to the explored list
-            self._explored.add(current_node)
-
-            # Print current movement step
-            if (PRINT_DEBUG == True):
-                print("Current position = ", current_position)
-                for agent_position in current_node.agent_path:
-                    self._maze.mark_position(agent_position[0], agent_position[1])
-                self._maze.select_position(current_position[0], current_position[1])
-                self._maze.print_map()
-                input("PRESS ANY KEY TO CONTINUE...")
-                self._maze.clear_path()
+            if (len(self._frontier) > stats.frontier_peak):
+                stats.frontier_peak = len(self._frontier)
+            _, current_node = self._frontier.pop()
+
+            # Discard nodes whose state was already expanded through a cheaper path
+            current_state = (current_node.break_wall * size) + current_node.position
+            if (self._explored[current_state] != 0):
+                stats.duplicates += 1
+                continue
+
+            # Stop if no remaining node can lead to a path shorter than the best result found
+            if ((self._path_length > 0) and (current_node.cost + 1 >= self._path_length)):
+                break
+
+            # Include current node state to the explored list
+            self._explored[current_state] = 1
+            stats.expanded += 1
+            y, x = divmod(current_node.position, self._width)
+
+            # Record current movement step
+            if (self._trace != None):
+                self._trace.record(current_node.position, current_node.cost, current_node.rank, len(self._frontier))
 
             # Test for goal position
             # If True, store the path just found (if it is shorter)
-            if (self.is_goal_position(current_position[0], current_position[1])):
-                new_path = current_node.agent_path
+            if (self.is_goal_position(y, x)):
+                new_path = self._trace_node_path(current_node)
                 new_path_length = len(new_path)
                 # Check for the shorter path
                 if ((self._path_length == 0) or (new_path_length < self._path_length)):
@@ -938,59 +2383,37 @@ class DijkstraAgent(Agent):
                     continue
 
             # If current position isn't the goal, search it's neighbors
-            for neighbor_position in self._maze.get_neighbors(current_position):
+            for offset, is_wall in self._neighbor_moves[self._neighbor_mask[current_node.position]]:
 
                 # First, check if the neighbor is a valid position (frontier path or breakable wall)
-                neighbor_break_wall = current_node.break_wall
-                neighbor_position_value = self._maze.get_position_value(neighbor_position[0], neighbor_position[1])
-                if (neighbor_position_value == 1):
-                    if (neighbor_break_wall > 0):
-                        neighbor_break_wall -= 1
-                    else:
-                        continue
-
-                # Check if neighbor is at current path already
-                is_neighbor_in_agent_path = False
-                for agent_path_position in current_node.agent_path:
-                    if (neighbor_position == agent_path_position):
-                        is_neighbor_in_agent_path = True
-                        break
-
-                # Checks if the cost of the current path is already greater than the best result found
-                neighbor_path = current_node.agent_path[:]
-                neighbor_path.append(neighbor_position)
-                neighbor_path_length = len(neighbor_path)
-                if ((self._path_length > 0) and (self._path_length < neighbor_path_length)):
-                    # Discard neighbor if it's path is too long
+                neighbor_break_wall = current_node.break_wall - is_wall
+                if (neighbor_break_wall < 0):
                     continue
 
-                # If neighbor is not in any of the lists, add it to frontier
-                if (is_neighbor_in_agent_path == False):
-                    neighbor_new_cost = current_node.cost + self._movement_cost(current_position, neighbor_position)
-                    neighbor_rank = self._heuristics(neighbor_position)
+                # If the neighbor state is new or reached through a cheaper path, add it to frontier
+                neighbor_position = current_node.position + offset
+                neighbor_state = (neighbor_break_wall * size) + neighbor_position
+                neighbor_new_cost = current_node.cost + 1
+                if ((self._explored[neighbor_state] == 0) and
+                        ((self._cost[neighbor_state] < 0) or (neighbor_new_cost < self._cost[neighbor_state]))):
+                    self._cost[neighbor_state] = neighbor_new_cost
+                    neighbor_rank = neighbor_new_cost
                     neighbor_node = AgentSearchNode(current_node, neighbor_rank, neighbor_new_cost, neighbor_position,
-                                                    neighbor_path, neighbor_break_wall)
-                    self._frontier.put(neighbor_node)
-
-            # Print current search
-            if (PRINT_DEBUG == True):
-                for explored_node in self._explored:
-                    self._maze.mark_position(explored_node.position[0], explored_node.position[1])
-                for frontier_node in self._frontier.queue:
-                    self._maze.select_position(frontier_node.position[0], frontier_node.position[1])
-                self._maze.select_position(current_position[0], current_position[1])
-                self._maze.print_map()
-                input("PRESS ANY KEY TO CONTINUE...")
-                self._maze.clear_path()
+                                                    neighbor_break_wall)
+                    self._frontier.push(neighbor_rank, neighbor_node)
+                    stats.generated += 1
+                else:
+                    stats.duplicates += 1
 
-        # If the frontier list gets empty, the goal was not found
-        return False
+        # If the frontier list gets empty, the search is over
+        return (self._path_length > 0)
 
 
 class AStarAgent(Agent):
     """A* Search Method
 
-    This class implements the A* Search algorithm.
+    This class implements the A* Search algorithm. The bidirectional mode searches from the start and goal positions at
+    the same time, when no wall can be broken.
 
     Args:
         Agent (object): The search algorithm intelligent agent parent class.
@@ -999,25 +2422,45 @@ class AStarAgent(Agent):
         object: The A* agent object.
     """
 
-    def __init__(self, maze, return_first=True, break_wall=0):
-        """Initialize the search agent and execute.
+    def __init__(self, maze, return_first=True, break_wall=0, junctions=False, fill_dead_ends=False,
+                 bidirectional=False, trace=None, stats=None):
+        """Initialize the search agent.
+
+        Args:
+            maze (Maze): The maze to be solved.
+            return_first (bool, optional): Stop the search at the first path found. Defaults to True.
+            break_wall (int, optional): The number of walls the agent can break. Defaults to 0.
+            junctions (bool, optional): Search the maze junction graph instead of the maze positions, when no wall can
+                                        be broken. Defaults to False.
+            fill_dead_ends (bool, optional): Fill the maze dead ends before the search, when no wall can be broken,
+                                             since broken walls could lead through the dead ends. Defaults to False.
+            bidirectional (bool, optional): Search from the start and goal positions at the same time, when no wall
+                                            can be broken. Defaults to False.
+            trace (TraceRecorder, optional): The recorder of the search expansions. Defaults to None.
+            stats (SearchStats, optional): The search counters and phase hooks. Defaults to None.
         """
         # Initialization process
-        Agent.__init__(self, maze)
+        Agent.__init__(self, maze, (fill_dead_ends and (break_wall == 0)), trace, stats)
         self._path = []
-        self._goal_position = self._maze.get_goal_position()
-        self._frontier = queue.PriorityQueue()
-        self._explored = set()
+        self._frontier = HeapQueue()
+        # Dense search state tables, shaped (break_wall + 1, height, width) and indexed by the encoded states
+        self._cost = [-1] * ((break_wall + 1) * self._height * self._width)
+        self._explored = bytearray((break_wall + 1) * self._height * self._width)
         self._return_first = return_first
         self._break_wall = break_wall
+        self._junctions = junctions
+        self._bidirectional = bidirectional
 
     def start(self):
         """Method that starts the goal search process and returns the resulting path.
         """
         # Execute the search
-        start_node = AgentSearchNode(0, 0, self._heuristics(self._start_position), self._start_position,
-                                     [self._start_position], self._break_wall)
-        return self._search(start_node)
+        with self._stats.phase("search", self):
+            if ((self._junctions == True) and (self._break_wall == 0)):
+                return self._search_junction_graph(self._heuristics)
+            if ((self._bidirectional == True) and (self._break_wall == 0)):
+                return self._search_bidirectional()
+            return self._search()
 
     def _movement_cost(self, origin=[], destination=[]):
         """Agent heuristic function that calculates movement costs.
@@ -1050,45 +2493,61 @@ class AStarAgent(Agent):
         """
         return self._movement_cost(coordinates, self._goal_position)
 
-    def _search(self, node):
+    def _search(self):
         """Agent search method.
 
-        Args:
-            node (AgentSearchNode): current A* node used in the search process.
+        Each search state is a maze position combined with the number of walls the agent can still break. States are
+        encoded as (break_wall * height * width) + (y * width + x), indexing the dense cost, parent and explored tables
+        of (break_wall + 1) layers, and the frontier is a binary heap of states ranked by the path cost plus the
+        heuristic estimation.
 
         Returns:
             bool: The movement result, where True means the goal position is reached and False that it hasn't.
         """
 
-        # Rename the input node
-        current_node = node
+        # Initialize the search tables
+        size = self._height * self._width
+        start_state = (self._break_wall * size) + (self._start_position[0] * self._width) + self._start_position[1]
+        cost = self._cost
+        cost[start_state] = 0
+        parent = [-1] * len(cost)
+        parent[start_state] = start_state
         # Update the frontier list (search border)
-        self._frontier.put(current_node)
+        self._frontier.push(self._heuristics(self._start_position), start_state)
+        stats = self._stats
+        stats.generated += 1
 
         # Iterate over the frontier queue
-        while (not self._frontier.empty()):
+        while (self._frontier):
 
-            # Remove the lowest ranking node from the queue
-            current_node = self._frontier.get()
-            current_position = current_node.position
-
-            # Include current node to the explored list
-            self._explored.add(current_node)
-
-            # Print current movement step
-            if (PRINT_DEBUG == True):
-                print("Current position = ", current_position)
-                for agent_position in current_node.agent_path:
-                    self._maze.mark_position(agent_position[0], agent_position[1])
-                self._maze.select_position(current_position[0], current_position[1])
-                self._maze.print_map()
-                input("PRESS ANY KEY TO CONTINUE...")
-                self._maze.clear_path()
+            # Remove the lowest ranking state from the queue
+            if (len(self._frontier) > stats.frontier_peak):
+                stats.frontier_peak = len(self._frontier)
+            rank, current_state = self._frontier.pop()
+
+            # Discard states that were already expanded through a cheaper path
+            if (self._explored[current_state] != 0):
+                stats.duplicates += 1
+                continue
+
+            # Stop if no remaining state can lead to a path shorter than the best result found
+            if ((self._path_length > 0) and (rank + 1 >= self._path_length)):
+                break
+
+            # Include current state to the explored list
+            self._explored[current_state] = 1
+            stats.expanded += 1
+            current_break_wall, current_index = divmod(current_state, size)
+            y, x = divmod(current_index, self._width)
+
+            # Record current movement step
+            if (self._trace != None):
+                self._trace.record(current_index, cost[current_state], rank, len(self._frontier))
 
             # Test for goal position
             # If True, store the path just found (if it is shorter)
-            if (self.is_goal_position(current_position[0], current_position[1])):
-                new_path = current_node.agent_path
+            if (self.is_goal_position(y, x)):
+                new_path = self._trace_path(parent, current_state)
                 new_path_length = len(new_path)
                 # Check for the shorter path
                 if ((self._path_length == 0) or (new_path_length < self._path_length)):
@@ -1101,59 +2560,697 @@ class AStarAgent(Agent):
                     continue
 
             # If current position isn't the goal, search it's neighbors
-            for neighbor_position in self._maze.get_neighbors(current_position):
+            neighbor_cost = cost[current_state] + 1
+            for offset, is_wall in self._neighbor_moves[self._neighbor_mask[current_index]]:
 
                 # First, check if the neighbor is a valid position (frontier path or breakable wall)
-                neighbor_break_wall = current_node.break_wall
-                neighbor_position_value = self._maze.get_position_value(neighbor_position[0], neighbor_position[1])
-                if (neighbor_position_value == 1):
-                    if (neighbor_break_wall > 0):
-                        neighbor_break_wall -= 1
-                    else:
-                        continue
+                neighbor_break_wall = current_break_wall - is_wall
+                if (neighbor_break_wall < 0):
+                    continue
 
-                # Check if neighbor is at current path already
-                is_neighbor_in_agent_path = False
-                for agent_path_position in current_node.agent_path:
-                    if (neighbor_position == agent_path_position):
-                        is_neighbor_in_agent_path = True
-                        break
+                # If the neighbor state is new or reached through a cheaper path, add it to frontier
+                neighbor_index = current_index + offset
+                neighbor_state = (neighbor_break_wall * size) + neighbor_index
+                if (self._explored[neighbor_state] != 0):
+                    stats.duplicates += 1
+                    continue
+                if ((cost[neighbor_state] < 0) or (neighbor_cost < cost[neighbor_state])):
+                    cost[neighbor_state] = neighbor_cost
+                    parent[neighbor_state] = current_state
+                    neighbor_heuristics = self._heuristics(divmod(neighbor_index, self._width))
+                    self._frontier.push((neighbor_cost + neighbor_heuristics), neighbor_state)
+                    stats.generated += 1
+                else:
+                    stats.duplicates += 1
+
+        # If the frontier list gets empty, the search is over
+        return (self._path_length > 0)
 
-                # Checks if the cost of the current path is already greater than the best result found
-                neighbor_path = current_node.agent_path[:]
-                neighbor_path.append(neighbor_position)
-                neighbor_path_length = len(neighbor_path)
-                if ((self._path_length > 0) and (self._path_length < neighbor_path_length)):
-                    # Discard neighbor if it's path is too long
+    def _search_bidirectional(self):
+        """Agent bidirectional search method.
+
+        Runs one A* search from the start position and another from the goal position, always expanding the side with
+        fewer positions waiting in its frontier. Both sides use the balanced potential p(v) = (h_goal(v) - h_start(v))
+        / 2 of the Manhattan distances, the start side ranking positions by g + p and the goal side by g - p, so both
+        searches see the same reduced movement costs. Ranks are doubled to keep them integer. Every time a neighbor
+        already reached by the other side is found, the cost of the path through it updates the best connection cost,
+        and the search stops when the sum of the lowest ranks of both frontiers can no longer improve it.
+
+        Returns:
+            bool: The search result, where True means the goal position is reached and False that it hasn't.
+        """
+        start_index = (self._start_position[0] * self._width) + self._start_position[1]
+        goal_index = (self._goal_position[0] * self._width) + self._goal_position[1]
+
+        # Doubled potential of a position for the start side, negated for the goal side
+        def potential(index):
+            position = divmod(index, self._width)
+            return (self._movement_cost(position, self._goal_position) -
+                    self._movement_cost(position, self._start_position))
+
+        # Search tables of the start (0) and goal (1) sides
+        costs = ({start_index: 0}, {goal_index: 0})
+        parents = ({start_index: start_index}, {goal_index: goal_index})
+        explored = (set(), set())
+        frontiers = (self._frontier, HeapQueue())
+        frontiers[0].push(potential(start_index), start_index)
+        frontiers[1].push(-potential(goal_index), goal_index)
+        # Number of positions waiting in each frontier, without the outdated queue entries
+        waiting = [1, 1]
+        best_cost = None
+        meeting = None
+        stats = self._stats
+        stats.generated += 2
+
+        # Iterate while both frontier queues have positions
+        while (waiting[0] and waiting[1]):
+            if (waiting[0] + waiting[1] > stats.frontier_peak):
+                stats.frontier_peak = waiting[0] + waiting[1]
+
+            # Discard the outdated entries of the frontier tops
+            for side in (0, 1):
+                while (frontiers[side].peek()[1] in explored[side]):
+                    frontiers[side].pop()
+                    stats.duplicates += 1
+
+            # Stop if no remaining position can lead to a path cheaper than the best connection found
+            if ((best_cost != None) and (frontiers[0].peek()[0] + frontiers[1].peek()[0] >= 2 * best_cost)):
+                break
+
+            # Remove the lowest ranking position from the smaller frontier
+            side = 0 if (waiting[0] <= waiting[1]) else 1
+            _, current_index = frontiers[side].pop()
+            explored[side].add(current_index)
+            waiting[side] -= 1
+            stats.expanded += 1
+
+            # Record current movement step, where the doubled rank isn't recorded
+            if (self._trace != None):
+                self._trace.record(current_index, costs[side][current_index], -1, (waiting[0] + waiting[1]))
+
+            # Search the position neighbors, updating the best connection with the other side
+            cost, parent, other_cost = costs[side], parents[side], costs[1 - side]
+            sign = 1 if (side == 0) else -1
+            neighbor_cost = cost[current_index] + 1
+            for offset in self._open_offsets[self._neighbor_mask[current_index]]:
+                neighbor_index = current_index + offset
+                if (neighbor_index in explored[side]):
+                    stats.duplicates += 1
                     continue
+                if ((neighbor_index not in cost) or (neighbor_cost < cost[neighbor_index])):
+                    if (neighbor_index not in cost):
+                        waiting[side] += 1
+                    cost[neighbor_index] = neighbor_cost
+                    parent[neighbor_index] = current_index
+                    frontiers[side].push(((2 * neighbor_cost) + (sign * potential(neighbor_index))), neighbor_index)
+                    stats.generated += 1
+                else:
+                    stats.duplicates += 1
+                if (neighbor_index in other_cost):
+                    connection_cost = neighbor_cost + other_cost[neighbor_index]
+                    if ((best_cost == None) or (connection_cost < best_cost)):
+                        best_cost = connection_cost
+                        meeting = (current_index, neighbor_index) if (side == 0) else (neighbor_index, current_index)
+
+        # Join the paths of both sides at the best connection
+        if (meeting == None):
+            return False
+        path = self._trace_path(parents[0], meeting[0])
+        path.extend(reversed(self._trace_path(parents[1], meeting[1])))
+        self._path = path
+        self._path_length = len(path)
+        return True
+
+
+class JPS_Search(Agent):
+    """Jump Point Search Method
+
+    This class implements the Jump Point Search algorithm, adapted to the 4-connected maze grid. Instead of adding
+    every neighbor to the frontier, the agent jumps along straight open runs and only adds the jump points, which are
+    the goal position, positions with a forced neighbor (an open side position whose previous side position is closed)
+    and, when moving vertically, positions from which a horizontal jump finds a jump point. The jump points are ranked
+    as in the A* search, so the path is optimal, and the straight runs between them are filled in when the path is
+    rebuilt.
+
+    Args:
+        Agent (object): The search algorithm intelligent agent parent class.
+
+    Returns:
+        object: The JPS agent object.
+    """
+
+    def __init__(self, maze, fill_dead_ends=False, trace=None, stats=None):
+        """Initialize the search agent and execute.
+
+        Args:
+            maze (Maze): The maze to be solved.
+            fill_dead_ends (bool, optional): Fill the maze dead ends before the search. Defaults to False.
+            trace (TraceRecorder, optional): The recorder of the search expansions. Defaults to None.
+            stats (SearchStats, optional): The search counters and phase hooks. Defaults to None.
+        """
+        # Initialization process
+        Agent.__init__(self, maze, fill_dead_ends, trace, stats)
+        self._goal_index = (self._goal_position[0] * self._width) + self._goal_position[1]
+        self._offsets = [((dy * self._width) + dx) for dy, dx in self.DIRECTIONS]
+        self._frontier = HeapQueue()
+        self._explored = set()
+        # Execute the search
+        with self._stats.phase("search", self):
+            self._search()
+
+    def _jump(self, index, direction):
+        """Jumps from a position along a direction, until a jump point is found or the run is blocked.
+
+        Horizontal jumps stop at positions with a forced vertical neighbor. Vertical jumps stop at positions with a
+        forced horizontal neighbor, or from which a horizontal jump finds a jump point.
+
+        Args:
+            index (int): The first position index of the jump, which must be open.
+            direction (int): The jump direction, as a DIRECTIONS index.
+
+        Returns:
+            int: The jump point position index, or None if the run is blocked before a jump point is found.
+        """
+        offset = self._offsets[direction]
+        bit = 1 << direction
+        # Side directions of the jump, vertical for horizontal jumps and horizontal for vertical ones
+        sides = (0, 1) if (direction >= 2) else (2, 3)
+        while True:
+            if (index == self._goal_index):
+                return index
+            mask = self._neighbor_mask[index]
+            previous_mask = self._neighbor_mask[index - offset]
+
+            # Check for forced neighbors
+            for side in sides:
+                if ((mask & (1 << side)) and not (previous_mask & (1 << side))):
+                    return index
+
+            # When moving vertically, check for horizontal jump points
+            if (direction < 2):
+                for side in sides:
+                    if ((mask & (1 << side)) and (self._jump((index + self._offsets[side]), side) != None)):
+                        return index
+
+            # Move on, if the run isn't blocked
+            if not (mask & bit):
+                return None
+            index += offset
+
+    def _trace_jump_path(self, parent, index):
+        """Rebuilds a path walking the jump point parents back from the input position index, filling in the straight
+        runs between consecutive jump points.
+
+        Args:
+            parent (dict): The parent jump point index of each jump point index.
+            index (int): The last path jump point index.
+
+        Returns:
+            list: The path coordinates [y, x] from the start position to the input position.
+        """
+        path = [list(divmod(index, self._width))]
+        while (parent[index] != index):
+            previous_index = parent[index]
+            # Straight runs go along a row (step 1) or along a column (step width)
+            step = 1 if ((index // self._width) == (previous_index // self._width)) else self._width
+            step = -step if (previous_index < index) else step
+            while (index != previous_index):
+                index += step
+                path.append(list(divmod(index, self._width)))
+        path.reverse()
+        return path
+
+    def _search(self):
+        """Agent search method.
+
+        Returns:
+            bool: The search result, where True means the goal position is reached and False that it hasn't.
+        """
+
+        # Initialize the search tables, where the jump direction of the start position is None (all directions)
+        start_index = (self._start_position[0] * self._width) + self._start_position[1]
+        cost = {start_index: 0}
+        parent = {start_index: start_index}
+        direction = {start_index: None}
+        self._frontier.push(self._goal_distance(start_index), start_index)
+        stats = self._stats
+        stats.generated += 1
+
+        # Iterate over the frontier queue
+        while (self._frontier):
+
+            # Remove the lowest ranking jump point from the queue
+            if (len(self._frontier) > stats.frontier_peak):
+                stats.frontier_peak = len(self._frontier)
+            rank, current_index = self._frontier.pop()
+            if (current_index in self._explored):
+                stats.duplicates += 1
+                continue
+            self._explored.add(current_index)
+            stats.expanded += 1
+
+            # Record current movement step
+            if (self._trace != None):
+                self._trace.record(current_index, cost[current_index], rank, len(self._frontier))
+
+            # Test for goal position
+            if (current_index == self._goal_index):
+                self._path = self._trace_jump_path(parent, current_index)
+                self._path_length = len(self._path)
+                return True
 
-                # If neighbor is not in any of the lists, add it to frontier
-                if (is_neighbor_in_agent_path == False):
-                    neighbor_new_cost = current_node.cost + self._movement_cost(current_position, neighbor_position)
-                    neighbor_rank = neighbor_new_cost + self._heuristics(neighbor_position)
-                    neighbor_node = AgentSearchNode(current_node, 0, neighbor_new_cost, neighbor_position,
-                                                    neighbor_path, neighbor_break_wall)
-                    self._frontier.put(neighbor_node)
-
-            # Print current search
-            if (PRINT_DEBUG == True):
-                for explored_node in self._explored:
-                    self._maze.mark_position(explored_node.position[0], explored_node.position[1])
-                for frontier_node in self._frontier.queue:
-                    self._maze.select_position(frontier_node.position[0], frontier_node.position[1])
-                self._maze.select_position(current_position[0], current_position[1])
-                self._maze.print_map()
-                input("PRESS ANY KEY TO CONTINUE...")
-                self._maze.clear_path()
+            # Prune the directions, keeping the jump direction and its sides (all directions for the start position)
+            mask = self._neighbor_mask[current_index]
+            current_direction = direction[current_index]
+            if (current_direction == None):
+                directions = (0, 1, 2, 3)
+            elif (current_direction >= 2):
+                directions = (current_direction, 0, 1)
+            else:
+                directions = (current_direction, 2, 3)
+
+            # Jump along each open direction, adding the jump points to the frontier
+            for neighbor_direction in directions:
+                if not (mask & (1 << neighbor_direction)):
+                    continue
+                jump_index = self._jump((current_index + self._offsets[neighbor_direction]), neighbor_direction)
+                if (jump_index == None):
+                    continue
+                if (jump_index in self._explored):
+                    stats.duplicates += 1
+                    continue
+                jump_cost = cost[current_index] + (abs(jump_index - current_index) //
+                                                   abs(self._offsets[neighbor_direction]))
+                if ((jump_index not in cost) or (jump_cost < cost[jump_index])):
+                    cost[jump_index] = jump_cost
+                    parent[jump_index] = current_index
+                    direction[jump_index] = neighbor_direction
+                    self._frontier.push((jump_cost + self._goal_distance(jump_index)), jump_index)
+                    stats.generated += 1
+                else:
+                    stats.duplicates += 1
 
         # If the frontier list gets empty, the goal was not found
         return False
 
 
 # **************************************************************
-#                  Application Entry Point
+#                        Batch Functions
 # **************************************************************
-if __name__ == "__main__":
+SEARCH_AGENTS = (BFS_Search, DFS_Search, IDFS_Search, DijkstraAgent, AStarAgent, JPS_Search)
+
+
+def run_agent(maze, agent_class, **options):
+    """Creates a search agent and executes its search over the input maze.
+
+    Args:
+        maze (Maze): The maze to be solved.
+        agent_class (type): The search agent class.
+        **options: The search agent keyword arguments, such as return_first and break_wall.
+
+    Returns:
+        Agent: The search agent object, after the search is executed.
+    """
+    agent = agent_class(maze, **options)
+    if (hasattr(agent, "start")):
+        agent.start()
+    return agent
+
+
+def _solve_batch_job(job):
+    """Solves one batch job maze using each of the job agents.
+
+    Args:
+        job (tuple): The (maze index, maze bytes or seed, agents, maze options) job values.
+
+    Returns:
+        list: The job results, one dictionary for each agent.
+    """
+    index, source, agents, maze_options = job
+    if (isinstance(source, bytes)):
+        maze = Maze.from_bytes(source)
+    else:
+        maze = Maze(seed=source, **maze_options)
+
+    results = []
+    for agent_class, options in agents:
+        start_time = time.perf_counter()
+        agent = run_agent(maze, agent_class, **options)
+        elapsed_time = time.perf_counter() - start_time
+        results.append({"maze": index, "agent": agent_class.__name__, "length": len(agent.get_path()),
+                        "time": elapsed_time})
+    return results
+
+
+def batch_solve(mazes, agents=SEARCH_AGENTS, maze_options=None, workers=None, chunksize=8):
+    """Solves many mazes using a set of search agents, spreading the work over a process pool.
+
+    Each maze is sent to the workers as a compact byte buffer, or as a seed when the worker must generate the maze
+    itself, and it is solved by every agent in the same worker.
+
+    Args:
+        mazes (iterable): The Maze objects or the integer seeds of the mazes to be generated.
+        agents (iterable, optional): The agent classes, or (agent class, keyword arguments) pairs. Defaults to all the
+                                     search agents.
+        maze_options (dict, optional): The Maze keyword arguments used to generate the mazes from seeds.
+        workers (int, optional): The maximum number of worker processes. Defaults to the number of processors.
+        chunksize (int, optional): The number of mazes sent to a worker at once. Defaults to 8.
+
+    Returns:
+        list: One dictionary for each (maze, agent) job, with the "maze" index, "agent" name, path "length" and
+              elapsed "time" in seconds.
+    """
+    agents = tuple(((agent, {}) if isinstance(agent, type) else (agent[0], dict(agent[1]))) for agent in agents)
+    maze_options = dict(maze_options or {})
+    jobs = ((index, (maze.to_bytes() if isinstance(maze, Maze) else int(maze)), agents, maze_options)
+            for index, maze in enumerate(mazes))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for job_results in executor.map(_solve_batch_job, jobs, chunksize=chunksize):
+            results.extend(job_results)
+    return results
+
+
+# **************************************************************
+#                       Path Cache Classes
+# **************************************************************
+class PathCache:
+    """Least recently used cache of the search agents paths.
+
+    Paths are stored per (maze fingerprint, agent class name, break_wall, other agent options) key, where the maze
+    fingerprint hashes the maze walls, start and goal positions. The cached paths are kept in memory up to a budget of
+    bytes, evicting the least recently used ones, and, when a directory is given, also written to it as .npy files, so
+    they are reused by other processes and cache objects after being evicted from memory.
+
+    The returned paths are read-only numpy arrays of [y, x] coordinates, shared by every caller of the same key.
+    """
+
+    # Estimated memory used by each cache entry besides the path array, in bytes
+    ENTRY_OVERHEAD = 256
+
+    def __init__(self, max_bytes=(64 * 1024 * 1024), directory=None):
+        """Initializes the cache.
+
+        Args:
+            max_bytes (int, optional): The memory budget of the cached paths, in bytes. Defaults to 64 MiB.
+            directory (str, optional): The directory of the on-disk cache tier, created if needed. Defaults to None,
+                                       which keeps the paths only in memory.
+        """
+        if (max_bytes < 0):
+            raise ValueError("The cache memory budget can't be negative: " + str(max_bytes))
+        self._max_bytes = max_bytes
+        self._directory = directory
+        if (directory != None):
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        """Returns the number of paths kept in memory.
+
+        Returns:
+            int: The number of cached paths in memory.
+        """
+        return len(self._entries)
+
+    def solve(self, maze, agent_class, break_wall=0, **options):
+        """Returns the path found by a search agent over the input maze, running the search only on cache misses.
+
+        Args:
+            maze (Maze): The maze to be solved.
+            agent_class (type): The search agent class.
+            break_wall (int, optional): The number of walls the agent can break, only accepted by the agents with a
+                                        start method. Defaults to 0.
+            **options: The other search agent keyword arguments, such as return_first.
+
+        Returns:
+            numpy.ndarray: The read-only path, with one [y, x] row for each position.
+        """
+        if (hasattr(agent_class, "start")):
+            options["break_wall"] = break_wall
+        elif (break_wall != 0):
+            raise ValueError(agent_class.__name__ + " can't break walls: " + str(break_wall))
+        key = (maze.get_fingerprint(), agent_class.__name__, break_wall, tuple(sorted(options.items())))
+
+        # Search the memory and disk tiers
+        path = self._entries.get(key)
+        if (path is not None):
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return path
+        path = self._load(key)
+        if (path is not None):
+            self._disk_hits += 1
+            self._store(key, path)
+            return path
+
+        # Run the search and store its path
+        self._misses += 1
+        agent = run_agent(maze, agent_class, **options)
+        path = numpy.array(agent.get_path(), dtype=numpy.int32).reshape(-1, 2)
+        path.setflags(write=False)
+        self._store(key, path)
+        self._save(key, path)
+        return path
+
+    def _store(self, key, path):
+        """Keeps a path in the memory tier, evicting the least recently used paths beyond the memory budget.
+
+        Args:
+            key (tuple): The cache key.
+            path (numpy.ndarray): The read-only path.
+        """
+        size = path.nbytes + self.ENTRY_OVERHEAD
+        if (size > self._max_bytes):
+            return
+        self._entries[key] = path
+        self._bytes += size
+        while (self._bytes > self._max_bytes):
+            _, evicted_path = self._entries.popitem(last=False)
+            self._bytes -= evicted_path.nbytes + self.ENTRY_OVERHEAD
+
+    def _get_file_path(self, key):
+        """Returns the disk tier file path of a cache key.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            str: The .npy file path, named by the key hash.
+        """
+        return os.path.join(self._directory, hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest() + ".npy")
+
+    def _load(self, key):
+        """Reads a path from the disk tier.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            numpy.ndarray: The read-only path, or None if the disk tier is disabled or doesn't hold the key.
+        """
+        if (self._directory == None):
+            return None
+        try:
+            path = numpy.load(self._get_file_path(key))
+        except (OSError, ValueError):
+            return None
+        path.setflags(write=False)
+        return path
+
+    def _save(self, key, path):
+        """Writes a path to the disk tier, replacing the file at once so readers never see it partially written.
+
+        Args:
+            key (tuple): The cache key.
+            path (numpy.ndarray): The path.
+        """
+        if (self._directory == None):
+            return
+        file_path = self._get_file_path(key)
+        temporary_path = file_path + "." + str(os.getpid()) + ".tmp"
+        with open(temporary_path, "wb") as file:
+            numpy.save(file, path)
+        os.replace(temporary_path, file_path)
+
+    def clear(self):
+        """Removes every path from the memory tier, keeping the disk tier files.
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_counts(self):
+        """Returns the cache usage counters.
+
+        Returns:
+            dict: The memory "hits", "disk_hits" and "misses" counts, plus the number of "entries" and "bytes" in
+                  memory.
+        """
+        return {"hits": self._hits, "disk_hits": self._disk_hits, "misses": self._misses,
+                "entries": len(self._entries), "bytes": self._bytes}
+
+
+# **************************************************************
+#                      Benchmark Functions
+# **************************************************************
+def benchmark_frontier(count=200000, seed=0):
+    """Compares the throughput of the search frontier queues.
+
+    Simulates a search workload, where every removed item inserts a new item with the same or a slightly higher rank,
+    and prints the number of removed items per second of each queue.
+
+    Args:
+        count (int, optional): The number of items inserted and removed from each queue. Defaults to 200000.
+        seed (int, optional): The random rank increments seed. Defaults to 0.
+
+    Returns:
+        dict: The removed items per second of each queue, indexed by the queue name.
+    """
+    increments = numpy.random.default_rng(seed).integers(0, 3, count).tolist()
+    nodes = [AgentSearchNode(None, 0, 0, 0, 0) for _ in range(count)]
+
+    def run_priority_queue():
+        frontier = queue.PriorityQueue()
+        frontier.put(nodes[0])
+        for i in range(1, count):
+            node = frontier.get()
+            nodes[i].rank = node.rank + increments[i]
+            frontier.put(nodes[i])
+        frontier.get()
+
+    def run_heap_queue():
+        frontier = HeapQueue()
+        frontier.push(0, 0)
+        for i in range(1, count):
+            rank, _ = frontier.pop()
+            frontier.push((rank + increments[i]), i)
+        frontier.pop()
+
+    result = {}
+    for name, run in (("PriorityQueue", run_priority_queue), ("HeapQueue", run_heap_queue)):
+        start_time = time.perf_counter()
+        run()
+        result[name] = count / (time.perf_counter() - start_time)
+
+    print("Queue\t\tPops/s\tSpeedup")
+    for name, pops in result.items():
+        print(name + "\t" + str(int(pops)) + "\t" + "{:.1f}x".format(pops / result["PriorityQueue"]))
+    return result
+
+
+def benchmark_agents(sizes=(11, 21, 31), complexities=(0.25, 0.75), densities=(0.25, 0.75), break_walls=(0, 1),
+                     seeds=(0, 1, 2), repeat=5, warmup=1, agents=SEARCH_AGENTS, output=None):
+    """Benchmarks the search agents over a sweep of reproducible mazes.
+
+    Every combination of maze size, complexity, density and seed is generated and solved by each agent. The agents
+    that accept a break_wall argument are run once for each break_wall value. Each agent runs warmup untimed times and
+    repeat timed times, and the peak memory is measured in an extra run, since tracing memory slows the search down.
+
+    Args:
+        sizes (tuple, optional): The maze widths and heights. Defaults to (11, 21, 31).
+        complexities (tuple, optional): The maze complexity values. Defaults to (0.25, 0.75).
+        densities (tuple, optional): The maze density values. Defaults to (0.25, 0.75).
+        break_walls (tuple, optional): The break_wall values. Defaults to (0, 1).
+        seeds (tuple, optional): The maze seeds. Defaults to (0, 1, 2).
+        repeat (int, optional): The number of timed runs, at least 1. Defaults to 5.
+        warmup (int, optional): The number of untimed runs executed before the timed ones. Defaults to 1.
+        agents (tuple, optional): The agent classes. Defaults to all the search agents.
+        output (str, optional): The results file path, written as JSON if it ends with ".json" and as CSV otherwise.
+                                Defaults to None, which prints the CSV results on screen.
+
+    Returns:
+        list: One dictionary of results for each (maze, agent, break_wall) combination.
+    """
+    if (repeat < 1):
+        raise ValueError("The number of timed runs must be at least 1: " + str(repeat))
+    if (warmup < 0):
+        raise ValueError("The number of warmup runs can't be negative: " + str(warmup))
+    results = []
+    for size in sizes:
+        for complexity in complexities:
+            for density in densities:
+                for seed in seeds:
+                    maze = Maze(size, size, complexity, density, seed=seed)
+                    for agent_class in agents:
+                        agent_break_walls = break_walls if (hasattr(agent_class, "start")) else (0,)
+                        for break_wall in agent_break_walls:
+                            options = {"break_wall": break_wall} if (hasattr(agent_class, "start")) else {}
+
+                            # Warm up and measure the agent search time
+                            for _ in range(warmup):
+                                run_agent(maze, agent_class, **options)
+                            times = []
+                            for _ in range(repeat):
+                                start_time = time.perf_counter()
+                                agent = run_agent(maze, agent_class, **options)
+                                times.append(time.perf_counter() - start_time)
+
+                            # Measure the agent search peak memory
+                            tracemalloc.start()
+                            run_agent(maze, agent_class, **options)
+                            peak_memory = tracemalloc.get_traced_memory()[1]
+                            tracemalloc.stop()
+
+                            results.append({
+                                "agent": agent_class.__name__,
+                                "size": size,
+                                "complexity": complexity,
+                                "density": density,
+                                "seed": seed,
+                                "break_wall": break_wall,
+                                "path_length": len(agent.get_path()),
+                                "expanded": agent.get_expanded_count(),
+                                "generated": agent.get_stats().generated,
+                                "duplicates": agent.get_stats().duplicates,
+                                "frontier_peak": agent.get_stats().frontier_peak,
+                                "median_ms": float(numpy.median(times)) * 1000,
+                                "p95_ms": float(numpy.percentile(times, 95)) * 1000,
+                                "peak_kib": peak_memory / 1024
+                            })
+
+    # Write the results
+    if ((output != None) and output.endswith(".json")):
+        with open(output, "w") as file:
+            json.dump(results, file, indent=2)
+    elif (output != None):
+        with open(output, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+    return results
+
+
+def benchmark_jump_points(sizes=(31, 61, 101), seeds=(0, 1, 2), repeat=5, output=None):
+    """Benchmarks the Jump Point Search agent against the A* agent over mazes with large open areas.
+
+    Args:
+        sizes (tuple, optional): The maze widths and heights. Defaults to (31, 61, 101).
+        seeds (tuple, optional): The maze seeds. Defaults to (0, 1, 2).
+        repeat (int, optional): The number of timed runs. Defaults to 5.
+        output (str, optional): The results file path, written as JSON if it ends with ".json" and as CSV otherwise.
+                                Defaults to None, which prints the CSV results on screen.
+
+    Returns:
+        list: One dictionary of results for each (maze, agent) combination.
+    """
+    return benchmark_agents(sizes=sizes, complexities=(0.05, 0.25), densities=(0.05, 0.25), break_walls=(0,),
+                            seeds=seeds, repeat=repeat, agents=(AStarAgent, JPS_Search), output=output)
+
+
+# **************************************************************
+#                      Application Functions
+# **************************************************************
+def demo():
+    """Creates a randomized maze and compares the path found by each search agent.
+    """
     # Create a randomized map and print
     maze_height = rand(5, 50)
     maze_width = rand(5, 50)
@@ -1220,3 +3317,65 @@ if __name__ == "__main__":
     while (not summary.empty()):
         length, elapsed_time, name = summary.get()
         print(" " + name + " " + str(length) + "\t" + str(elapsed_time))
+
+    # Replay the recorded search expansions
+    if (PRINT_DEBUG == True):
+        for name, agent in (("BFS", bfs_agent), ("DFS", dfs_agent), ("IDFS", idfs_agent),
+                            ("Dijkstra", dijkstra_agent), ("A*", as_agent)):
+            print("\n " + name + " Search Replay:")
+            TraceReplayer(maze, agent.get_trace().get_events()).play()
+
+
+def batch(count, size, seed=0, workers=None):
+    """Solves a batch of randomized mazes using all the search agents and prints the results summary.
+
+    Args:
+        count (int): The number of mazes.
+        size (int): The mazes width and height.
+        seed (int, optional): The first maze seed, incremented for each maze. Defaults to 0.
+        workers (int, optional): The maximum number of worker processes. Defaults to the number of processors.
+    """
+    start_time = time.perf_counter()
+    results = batch_solve(range(seed, (seed + count)), maze_options={"width": size, "height": size}, workers=workers)
+    elapsed_time = time.perf_counter() - start_time
+
+    print("Method\t\tJobs\tLength\tTime (ms)")
+    for agent_class in SEARCH_AGENTS:
+        agent_results = [result for result in results if (result["agent"] == agent_class.__name__)]
+        length = sum(result["length"] for result in agent_results) / len(agent_results)
+        agent_time = sum(result["time"] for result in agent_results) * 1000 / len(agent_results)
+        print(agent_class.__name__ + "\t" + str(len(agent_results)) + "\t" + "{:.1f}".format(length) + "\t" +
+              "{:.3f}".format(agent_time))
+    print("Solved " + str(len(results)) + " jobs in " + "{:.3f}".format(elapsed_time) + " s (" +
+          "{:.1f}".format(len(results) / elapsed_time) + " jobs/s)")
+
+
+# **************************************************************
+#                  Application Entry Point
+# **************************************************************
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compares classic search algorithms in solving random mazes.")
+    parser.add_argument("command", nargs="?", default="demo",
+                        choices=["demo", "batch", "benchmark", "benchmark-frontier", "benchmark-jps"],
+                        help="the command to run (default: demo)")
+    parser.add_argument("--mazes", type=int, default=100, help="number of mazes solved by the batch (default: 100)")
+    parser.add_argument("--size", type=int, default=31, help="width and height of the batch mazes (default: 31)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first batch maze (default: 0)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed benchmark runs (default: 5)")
+    parser.add_argument("--output", default=None, help="benchmark results file, .json or .csv (default: screen)")
+    parser.add_argument("--no-color", action="store_true", help="print the mazes without terminal colors")
+    args = parser.parse_args()
+    if (args.no_color == True):
+        PRINT_COLOR = False
+
+    if (args.command == "batch"):
+        batch(args.mazes, args.size, args.seed, args.workers)
+    elif (args.command == "benchmark"):
+        benchmark_agents(repeat=args.repeat, output=args.output)
+    elif (args.command == "benchmark-frontier"):
+        benchmark_frontier()
+    elif (args.command == "benchmark-jps"):
+        benchmark_jump_points(repeat=args.repeat, output=args.output)
+    else:
+        demo()